@@ -14,12 +14,15 @@ class Settings:
     DESCRIPTION: str = "Comprehensive cybersecurity scanning service"
     HOST: str = os.getenv("HOST", "0.0.0.0")
     PORT: int = int(os.getenv("PORT", "8001"))
+    DEMO_MODE: bool = os.getenv("DEMO_MODE", "false").lower() == "true"  # No Redis/Celery; scans run inline
     
     # Database Configuration
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./demo_scanner.db")
     
     # Redis Configuration
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    REDIS_UNIX_SOCKET: str = os.getenv("REDIS_UNIX_SOCKET", "")  # e.g. /var/run/redis.sock when Redis is local
+    REDIS_MAX_CONNECTIONS: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "128"))
     
     # Celery Configuration
     CELERY_BROKER_URL: str = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
@@ -68,6 +71,11 @@ class Settings:
     MAX_WORKERS: int = int(os.getenv("MAX_WORKERS", "4"))
     WORKER_MEMORY_LIMIT: int = int(os.getenv("WORKER_MEMORY_LIMIT", "512"))  # MB
     
+    # API Response Caching (per process)
+    SCAN_STATUS_CACHE_TTL: int = 2  # seconds; absorbs UI status polling
+    SCAN_RESULTS_CACHE_TTL: int = 600  # seconds; completed scans only
+    SCAN_CACHE_SIZE: int = 10000
+    
     # Logging Configuration
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
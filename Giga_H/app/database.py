@@ -1,6 +1,7 @@
 """Database configuration and session management."""
 
 import os
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
@@ -10,12 +11,21 @@ from app.models import Base
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./demo_scanner.db")
 
+
+def _json_serializer(value) -> str:
+    """Encode JSON column values with orjson instead of the stdlib encoder."""
+    # OPT_NON_STR_KEYS keeps parity with json.dumps, which accepts int keys
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Create engine with appropriate settings for SQLite
 if DATABASE_URL.startswith("sqlite"):
     engine = create_engine(
         DATABASE_URL,
         poolclass=StaticPool,
         connect_args={"check_same_thread": False},
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
         echo=False
     )
 else:
@@ -25,7 +35,9 @@ else:
         pool_size=10,
         max_overflow=20,
         pool_pre_ping=True,
-        pool_recycle=3600
+        pool_recycle=3600,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads
     )
 
 # Create session factory
@@ -5,7 +5,7 @@ from enum import Enum
 from typing import Optional, Dict, Any
 from uuid import uuid4
 
-from sqlalchemy import Column, String, DateTime, Integer, Text, JSON, Boolean, Float
+from sqlalchemy import Column, String, DateTime, Integer, Text, JSON, Boolean, Float, Index, and_
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy import String as SQLString
@@ -59,6 +59,17 @@ class ScanRecord(Base):
     summary = Column(JSON, nullable=True)
     error_message = Column(Text, nullable=True)
     client_ip = Column(String(45), nullable=True)
+    
+    __table_args__ = (
+        # Partial index over exactly the rows retention still has to
+        # anonymize; created_at alone is covered by its column index
+        Index(
+            'ix_scan_records_anonymize_candidates',
+            created_at,
+            postgresql_where=and_(client_ip.isnot(None), target.notlike('anonymous-%')),
+            sqlite_where=and_(client_ip.isnot(None), target.notlike('anonymous-%'))
+        ),
+    )
 
 
 # Pydantic Models for API
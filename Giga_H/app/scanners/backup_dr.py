@@ -6,7 +6,7 @@ from typing import Dict, List, Any, Optional
 from urllib.parse import urljoin
 import re
 
-from app.scanners.base import BaseScanner, NetworkTimeoutError, ScanningNotPossibleError
+from app.scanners.base import BaseScanner, NetworkTimeoutError, ScanningNotPossibleError, ScanContext
 from app.config import settings
 
 
@@ -19,8 +19,9 @@ class BackupDRScanner(BaseScanner):
     - DR site accessibility
     """
     
-    def __init__(self, target: str, scan_type: str = "full"):
-        super().__init__(target, scan_type)
+    def __init__(self, target: str, scan_type: str = "full", timeout: Optional[int] = None,
+                 ctx: Optional[ScanContext] = None):
+        super().__init__(target, scan_type, timeout, ctx)
         self.results = {
             "exposed_backups": [],
             "dr_sites": [],
@@ -52,6 +53,18 @@ class BackupDRScanner(BaseScanner):
         """
         Perform backup and DR assessment.
         
+        Returns:
+            dict: Backup and DR assessment results
+        """
+        return asyncio.run(self.scan_async())
+    
+    async def scan_async(self, session: Optional[aiohttp.ClientSession] = None) -> Dict[str, Any]:
+        """
+        Perform backup and DR assessment on the running event loop.
+        
+        Args:
+            session: Shared HTTP session, or None to open a private one
+            
         Returns:
             dict: Backup and DR assessment results
         """
@@ -59,7 +72,7 @@ class BackupDRScanner(BaseScanner):
         
         try:
             # Run async scanning operations
-            asyncio.run(self._perform_backup_scan())
+            await self._perform_backup_scan(session)
             
             # Generate recommendations
             self._generate_recommendations()
@@ -73,27 +86,33 @@ class BackupDRScanner(BaseScanner):
         except Exception as e:
             return self.handle_network_error("backup and DR assessment", str(e))
     
-    async def _perform_backup_scan(self) -> None:
+    async def _perform_backup_scan(self, session: Optional[aiohttp.ClientSession] = None) -> None:
         """
         Perform the main backup and DR scanning operations.
+        
+        Args:
+            session: Shared HTTP session, or None to open a private one
         """
-        timeout = aiohttp.ClientTimeout(total=self.timeout)
-        connector = aiohttp.TCPConnector(ssl=False, limit=10)
-        
-        async with aiohttp.ClientSession(
-            timeout=timeout,
-            connector=connector,
-            headers={"User-Agent": "Security-Scanner/1.0"}
-        ) as session:
-            
-            # Check for exposed backup files
-            await self._check_exposed_backups(session)
-            
-            # Check for exposed configuration files
-            await self._check_config_files(session)
+        if session is None:
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            connector = aiohttp.TCPConnector(ssl=False, limit=10)
             
-            # Discover DR sites
-            await self._discover_dr_sites(session)
+            async with aiohttp.ClientSession(
+                timeout=timeout,
+                connector=connector,
+                headers={"User-Agent": "Security-Scanner/1.0"}
+            ) as session:
+                await self._perform_backup_scan(session)
+            return
+        
+        # Check for exposed backup files
+        await self._check_exposed_backups(session)
+        
+        # Check for exposed configuration files
+        await self._check_config_files(session)
+        
+        # Discover DR sites
+        await self._discover_dr_sites(session)
     
     async def _check_exposed_backups(self, session: aiohttp.ClientSession) -> None:
         """
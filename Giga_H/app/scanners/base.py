@@ -1,11 +1,140 @@
 """Base scanner class with common functionality."""
 
 import time
+import socket
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+import aiohttp
 from app.config import settings
 from app.utils.validator import validate_target, is_valid_ip, get_domain_from_url
+from app.utils.cache import TTLCache
+
+try:
+    import aiodns  # noqa: F401  (enables aiohttp's AsyncResolver)
+except ImportError:
+    aiodns = None
+
+# Connection limits for the HTTP session shared by all scanners of a scan
+SCAN_SESSION_LIMIT = 100
+SCAN_SESSION_LIMIT_PER_HOST = 10
+SCAN_DNS_CACHE_TTL = 300
+
+# Addresses resolved for the blocking socket scanners, shared between them
+_address_cache = TTLCache(maxsize=1024, ttl=SCAN_DNS_CACHE_TTL)
+
+
+def resolve_host(host: str, family: int = socket.AF_UNSPEC) -> Tuple[str, ...]:
+    """
+    Resolve a host name to its IP addresses, caching the answer.
+    
+    Args:
+        host: Host name or IP address
+        family: Address family (AF_INET, AF_INET6 or AF_UNSPEC for either)
+        
+    Returns:
+        tuple: IP addresses in getaddrinfo order, without duplicates
+        
+    Raises:
+        socket.gaierror: If the name cannot be resolved
+    """
+    key = (host, family)
+    addresses = _address_cache.get(key)
+    if addresses is None:
+        infos = socket.getaddrinfo(host, None, family, socket.SOCK_STREAM)
+        addresses = tuple(dict.fromkeys(info[4][0] for info in infos))
+        _address_cache.set(key, addresses)
+    return addresses
+
+
+def create_scan_session(timeout: Optional[int] = None) -> aiohttp.ClientSession:
+    """
+    Create an HTTP session to share between scanners via scan_async().
+    
+    One pooled connector serves every scanner, so connections and DNS
+    lookups to the target are reused across them. Must be created inside
+    a running event loop.
+    
+    Args:
+        timeout: Total timeout per request in seconds (default: SCAN_TIMEOUT)
+        
+    Returns:
+        aiohttp.ClientSession: Session to use as an async context manager
+    """
+    connector = aiohttp.TCPConnector(
+        ssl=False,
+        limit=SCAN_SESSION_LIMIT,
+        limit_per_host=SCAN_SESSION_LIMIT_PER_HOST,
+        ttl_dns_cache=SCAN_DNS_CACHE_TTL,
+        resolver=aiohttp.AsyncResolver() if aiodns else None
+    )
+    return aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=timeout or settings.SCAN_TIMEOUT),
+        connector=connector,
+        headers={"User-Agent": "Security-Scanner/1.0"}
+    )
+
+
+@dataclass
+class ScanContext:
+    """
+    Resources shared by every scanner in one scan pass over a target.
+    
+    The target is resolved once, and HTTP connections and DNS answers are
+    pooled across scanners instead of each one setting up its own. Build
+    it with create_scan_context() and close() it when the scan is done.
+    """
+    target: str
+    addresses: Tuple[str, ...]
+    http_session: Any  # requests.Session
+    dns_resolver: Any  # dns.resolver.Resolver
+    
+    def close(self) -> None:
+        """Release pooled HTTP connections."""
+        self.http_session.close()
+
+
+def create_scan_context(target: str, timeout: Optional[int] = None) -> ScanContext:
+    """
+    Create the shared resources for scanning one target.
+    
+    Args:
+        target: Target to scan (IP or domain)
+        timeout: Network timeout in seconds (default: SCAN_TIMEOUT)
+        
+    Returns:
+        ScanContext: Context to pass to each scanner as ctx=
+    """
+    import dns.resolver
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    target = target.strip()
+    if is_valid_ip(target):
+        addresses = (target,)
+    else:
+        try:
+            addresses = resolve_host(target)
+        except OSError:
+            addresses = (target,)
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=64,
+        max_retries=Retry(total=2, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": "Security-Scanner/1.0"})
+    
+    resolver = dns.resolver.Resolver()
+    resolver.cache = dns.resolver.Cache()
+    resolver.timeout = resolver.lifetime = min(settings.DNS_TIMEOUT, timeout or settings.SCAN_TIMEOUT)
+    
+    return ScanContext(target, addresses, session, resolver)
 
 
 class BaseScannerError(Exception):
@@ -33,17 +162,21 @@ class BaseScanner(ABC):
     Base scanner class providing common functionality for all scanners.
     """
     
-    def __init__(self, target: str, scan_type: str = "full"):
+    def __init__(self, target: str, scan_type: str = "full", timeout: Optional[int] = None,
+                 ctx: Optional[ScanContext] = None):
         """
         Initialize base scanner.
         
         Args:
             target: Target to scan (IP or domain)
             scan_type: Type of scan (quick, full, custom)
+            timeout: Network timeout in seconds (default: SCAN_TIMEOUT)
+            ctx: Resources shared with the other scanners of this scan, if any
         """
         self.target = target.strip()
         self.scan_type = scan_type
-        self.timeout = settings.SCAN_TIMEOUT
+        self.timeout = timeout or settings.SCAN_TIMEOUT
+        self.ctx = ctx
         self.start_time = None
         self.is_ip = is_valid_ip(self.target)
         self.domain = self.target if not self.is_ip else None
@@ -62,9 +195,73 @@ class BaseScanner(ABC):
         """
         pass
     
+    async def scan_async(self, session: Optional[aiohttp.ClientSession] = None) -> Dict[str, Any]:
+        """
+        Perform the scan from inside a running event loop.
+        
+        Scanners built on aiohttp override this to run on the caller's loop
+        with a shared session; the default runs the blocking scan() on a
+        worker thread so it never stalls the loop.
+        
+        Args:
+            session: Shared HTTP session from create_scan_session(), if any
+            
+        Returns:
+            dict: Scan results with status, data, and optional note
+        """
+        return await asyncio.to_thread(self.scan)
+    
+    def resolve_target(self, family: int = socket.AF_UNSPEC) -> Tuple[str, ...]:
+        """
+        Get the target's IP addresses for direct socket connections.
+        
+        Resolving once up front saves a DNS lookup per connection attempt.
+        
+        Args:
+            family: Address family (AF_INET, AF_INET6 or AF_UNSPEC for either)
+            
+        Returns:
+            tuple: IP addresses, or just the target itself if it cannot be
+                   resolved (so connecting reports the usual error)
+        """
+        if self.is_ip:
+            return (self.target,)
+        if self.ctx is not None and family == socket.AF_UNSPEC:
+            return self.ctx.addresses
+        try:
+            return resolve_host(self.target, family)
+        except OSError:
+            return (self.target,)
+    
+    def connect_target(self, port: int, timeout: float) -> socket.socket:
+        """
+        Open a TCP connection to the target.
+        
+        Like socket.create_connection(), each resolved address is tried in
+        turn, so dual-stack hosts still connect when the first one is
+        unreachable; the resolution itself comes from the cache.
+        
+        Args:
+            port: Port to connect to
+            timeout: Timeout per connection attempt in seconds
+            
+        Returns:
+            socket.socket: Connected socket
+            
+        Raises:
+            OSError: The error from the last address tried
+        """
+        error = None
+        for address in self.resolve_target():
+            try:
+                return socket.create_connection((address, port), timeout)
+            except OSError as e:
+                error = e
+        raise error
+    
     def start_scan(self) -> None:
         """Mark scan start time."""
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
     
     def get_scan_duration(self) -> Optional[str]:
         """
@@ -76,7 +273,7 @@ class BaseScanner(ABC):
         if self.start_time is None:
             return None
         
-        duration = time.time() - self.start_time
+        duration = time.perf_counter() - self.start_time
         
         if duration < 60:
             return f"{duration:.1f} seconds"
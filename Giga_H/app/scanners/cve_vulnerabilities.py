@@ -8,7 +8,7 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import hashlib
 
-from app.scanners.base import BaseScanner, NetworkTimeoutError, ScanningNotPossibleError
+from app.scanners.base import BaseScanner, NetworkTimeoutError, ScanningNotPossibleError, ScanContext
 from app.config import settings
 
 
@@ -21,8 +21,9 @@ class CVEVulnerabilityScanner(BaseScanner):
     - Integration with NVD (National Vulnerability Database)
     """
     
-    def __init__(self, target: str, scan_type: str = "full"):
-        super().__init__(target, scan_type)
+    def __init__(self, target: str, scan_type: str = "full", timeout: Optional[int] = None,
+                 ctx: Optional[ScanContext] = None):
+        super().__init__(target, scan_type, timeout, ctx)
         self.results = {
             "vulnerabilities": [],
             "risk_summary": {
@@ -50,6 +51,22 @@ class CVEVulnerabilityScanner(BaseScanner):
         """
         Perform CVE vulnerability assessment.
         
+        Returns:
+            dict: Vulnerability assessment results
+        """
+        return asyncio.run(self.scan_async())
+    
+    async def scan_async(self, session: Optional[aiohttp.ClientSession] = None) -> Dict[str, Any]:
+        """
+        Perform CVE vulnerability assessment on the running event loop.
+        
+        The shared scan session is not used: it skips certificate checks
+        for the target, while this scanner talks to the NVD API, which
+        keeps its own verified session.
+        
+        Args:
+            session: Shared HTTP session (ignored)
+            
         Returns:
             dict: Vulnerability assessment results
         """
@@ -66,7 +83,7 @@ class CVEVulnerabilityScanner(BaseScanner):
                 })
             
             # Analyze vulnerabilities for detected services
-            asyncio.run(self._analyze_vulnerabilities())
+            await self._analyze_vulnerabilities()
             
             # Calculate risk summary
             self._calculate_risk_summary()
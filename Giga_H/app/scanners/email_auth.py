@@ -5,7 +5,7 @@ import dns.exception
 import re
 from typing import Dict, List, Any, Optional
 
-from app.scanners.base import BaseScanner, NetworkTimeoutError, ScanningNotPossibleError
+from app.scanners.base import BaseScanner, NetworkTimeoutError, ScanningNotPossibleError, ScanContext
 from app.config import settings
 
 
@@ -18,8 +18,9 @@ class EmailAuthScanner(BaseScanner):
     - MX record security assessment
     """
     
-    def __init__(self, target: str, scan_type: str = "full"):
-        super().__init__(target, scan_type)
+    def __init__(self, target: str, scan_type: str = "full", timeout: Optional[int] = None,
+                 ctx: Optional[ScanContext] = None):
+        super().__init__(target, scan_type, timeout, ctx)
         self.results = {
             "spf": None,
             "dkim": None,
@@ -48,15 +49,11 @@ class EmailAuthScanner(BaseScanner):
             if self.is_ip:
                 return self.handle_service_not_found("email authentication (IP addresses not supported)")
             
-            # Set DNS timeout with fallback
-            try:
-                dns.resolver.default_resolver.timeout = getattr(settings, 'DNS_TIMEOUT', 10)
-                dns.resolver.default_resolver.lifetime = getattr(settings, 'DNS_TIMEOUT', 10)
-            except AttributeError:
-                # Fallback if resolver not properly initialized
-                dns.resolver.default_resolver = dns.resolver.Resolver()
-                dns.resolver.default_resolver.timeout = 10
-                dns.resolver.default_resolver.lifetime = 10
+            # A shared scan context brings its own cached, configured resolver
+            if self.ctx is not None:
+                self._resolver = self.ctx.dns_resolver
+            else:
+                self._resolver = self._default_resolver()
             
             # Check MX records first
             self._check_mx_records()
@@ -79,6 +76,31 @@ class EmailAuthScanner(BaseScanner):
         except Exception as e:
             return self.handle_network_error("email authentication analysis", str(e))
     
+    def _default_resolver(self) -> dns.resolver.Resolver:
+        """
+        Configure and return the process-wide default resolver.
+        
+        Returns:
+            dns.resolver.Resolver: Resolver to use for this scan
+        """
+        # Set DNS timeout with fallback, never exceeding the scanner's own
+        dns_timeout = min(getattr(settings, 'DNS_TIMEOUT', 10), self.timeout)
+        try:
+            dns.resolver.default_resolver.timeout = dns_timeout
+            dns.resolver.default_resolver.lifetime = dns_timeout
+        except AttributeError:
+            # Fallback if resolver not properly initialized
+            dns.resolver.default_resolver = dns.resolver.Resolver()
+            dns.resolver.default_resolver.timeout = dns_timeout
+            dns.resolver.default_resolver.lifetime = dns_timeout
+        
+        # Cache answers for their TTL, so lookups repeated across scans
+        # of the same domain skip the round-trip
+        if dns.resolver.default_resolver.cache is None:
+            dns.resolver.default_resolver.cache = dns.resolver.Cache()
+        
+        return dns.resolver.default_resolver
+    
     def _check_mx_records(self) -> None:
         """
         Check MX records for the domain.
@@ -86,7 +108,7 @@ class EmailAuthScanner(BaseScanner):
         try:
             self.log_scan_info("Checking MX records")
             
-            mx_records = dns.resolver.resolve(self.target, 'MX')
+            mx_records = self._resolver.resolve(self.target, 'MX')
             
             for mx in mx_records:
                 mx_info = {
@@ -130,7 +152,7 @@ class EmailAuthScanner(BaseScanner):
             self.log_scan_info("Analyzing SPF record")
             
             # Query TXT records for SPF
-            txt_records = dns.resolver.resolve(self.target, 'TXT')
+            txt_records = self._resolver.resolve(self.target, 'TXT')
             
             spf_record = None
             for record in txt_records:
@@ -241,7 +263,7 @@ class EmailAuthScanner(BaseScanner):
             for selector in selectors_to_check:
                 try:
                     dkim_domain = f"{selector}._domainkey.{self.target}"
-                    txt_records = dns.resolver.resolve(dkim_domain, 'TXT')
+                    txt_records = self._resolver.resolve(dkim_domain, 'TXT')
                     
                     for record in txt_records:
                         record_text = str(record).strip('"')
@@ -319,7 +341,7 @@ class EmailAuthScanner(BaseScanner):
             
             # Query DMARC record
             dmarc_domain = f"_dmarc.{self.target}"
-            txt_records = dns.resolver.resolve(dmarc_domain, 'TXT')
+            txt_records = self._resolver.resolve(dmarc_domain, 'TXT')
             
             dmarc_record = None
             for record in txt_records:
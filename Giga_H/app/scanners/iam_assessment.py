@@ -6,12 +6,15 @@ from typing import Dict, List, Any, Optional, TYPE_CHECKING
 from urllib.parse import urljoin, urlparse
 import re
 
-from app.scanners.base import BaseScanner, NetworkTimeoutError, ScanningNotPossibleError
+from app.scanners.base import BaseScanner, NetworkTimeoutError, ScanningNotPossibleError, ScanContext
 from app.config import settings
 
 if TYPE_CHECKING:
     import requests
 
+# Page title of admin interface responses
+_TITLE_RE = re.compile(r'<title[^>]*>([^<]+)</title>', re.IGNORECASE)
+
 
 class IAMAssessmentScanner(BaseScanner):
     """
@@ -22,8 +25,9 @@ class IAMAssessmentScanner(BaseScanner):
     - Basic access control assessment (ethical limits only)
     """
     
-    def __init__(self, target: str, scan_type: str = "full"):
-        super().__init__(target, scan_type)
+    def __init__(self, target: str, scan_type: str = "full", timeout: Optional[int] = None,
+                 ctx: Optional[ScanContext] = None):
+        super().__init__(target, scan_type, timeout, ctx)
         self.results = {
             "admin_interfaces": [],
             "cloud_services": {
@@ -89,12 +93,35 @@ class IAMAssessmentScanner(BaseScanner):
         """
         Synchronous fallback implementation for IAM scanning.
         """
+        self.log_scan_info("Using synchronous fallback for IAM scanning")
+        
+        # Reuse the scan's pooled session (same retry policy) when shared
+        if self.ctx is not None:
+            session = self.ctx.http_session
+        else:
+            session = self._create_session()
+        
+        try:
+            # Discover admin interfaces (sync version)
+            self._discover_admin_interfaces_sync(session)
+            
+            # Quick cloud service check (basic)
+            self._check_cloud_services_sync(session)
+            
+        except Exception as e:
+            self.log_scan_info(f"Sync IAM scan error: {e}")
+        finally:
+            if self.ctx is None:
+                session.close()
+    
+    def _create_session(self) -> "requests.Session":
+        """
+        Create a requests session with retries for this scan alone.
+        """
         import requests
         from requests.adapters import HTTPAdapter
         from urllib3.util.retry import Retry
         
-        self.log_scan_info("Using synchronous fallback for IAM scanning")
-        
         # Configure requests session with retries and timeout
         session = requests.Session()
         retry_strategy = Retry(
@@ -107,18 +134,7 @@ class IAMAssessmentScanner(BaseScanner):
         session.mount("https://", adapter)
         
         session.headers.update({"User-Agent": "Security-Scanner/1.0"})
-        
-        try:
-            # Discover admin interfaces (sync version)
-            self._discover_admin_interfaces_sync(session)
-            
-            # Quick cloud service check (basic)
-            self._check_cloud_services_sync(session)
-            
-        except Exception as e:
-            self.log_scan_info(f"Sync IAM scan error: {e}")
-        finally:
-            session.close()
+        return session
     
     def _discover_admin_interfaces_sync(self, session) -> None:
         """
@@ -181,8 +197,7 @@ class IAMAssessmentScanner(BaseScanner):
         Extract page title from HTML content.
         """
         try:
-            import re
-            title_match = re.search(r'<title[^>]*>([^<]+)</title>', html_content, re.IGNORECASE)
+            title_match = _TITLE_RE.search(html_content)
             return title_match.group(1).strip() if title_match else None
         except:
             return None
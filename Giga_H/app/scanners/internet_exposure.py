@@ -8,7 +8,7 @@ import time
 import subprocess
 import platform
 
-from app.scanners.base import BaseScanner, NetworkTimeoutError, ScanningNotPossibleError
+from app.scanners.base import BaseScanner, NetworkTimeoutError, ScanningNotPossibleError, ScanContext
 from app.config import settings
 
 # Try to import nmap, but don't fail if it's not available
@@ -24,17 +24,30 @@ class InternetExposureScanner(BaseScanner):
     """
     Scanner for detecting open ports, services, and OS fingerprinting.
     Uses nmap when available, falls back to native Python port scanning.
+    
+    scan_method picks the port scan explicitly: "nmap" (deep mode with
+    version and OS detection), "socket" (thread pool connect scan) or
+    "asyncio" (fast concurrent connect scan). None keeps the automatic
+    nmap-then-socket choice.
     """
     
-    def __init__(self, target: str, scan_type: str = "full"):
-        super().__init__(target, scan_type)
+    # Limits for the asyncio connect scan
+    ASYNC_MAX_CONNECTIONS = 512
+    ASYNC_CONNECT_TIMEOUT = 0.5  # seconds per port
+    
+    def __init__(self, target: str, scan_type: str = "full", timeout: Optional[int] = None,
+                 ctx: Optional[ScanContext] = None, scan_method: Optional[str] = None):
+        super().__init__(target, scan_type, timeout, ctx)
         self.nm = None
         self.use_nmap = False
         self.open_ports = []
         self.os_fingerprint = None
         
+        if scan_method not in (None, "nmap", "socket", "asyncio"):
+            raise ValueError(f"Unknown scan method: {scan_method}")
+        
         # Try to initialize nmap if available
-        if NMAP_AVAILABLE:
+        if NMAP_AVAILABLE and scan_method in (None, "nmap"):
             try:
                 self.nm = nmap.PortScanner()
                 self.use_nmap = True
@@ -43,7 +56,13 @@ class InternetExposureScanner(BaseScanner):
                 self.log_scan_info(f"Nmap initialization failed: {e}")
                 self.use_nmap = False
         
-        if not self.use_nmap:
+        if self.use_nmap:
+            self.scan_method = "nmap"
+        elif scan_method == "asyncio":
+            self.scan_method = "asyncio"
+            self.log_scan_info("Using asyncio connect scanning")
+        else:
+            self.scan_method = "socket"
             self.log_scan_info("Using fallback Python socket scanning")
         
     def scan(self) -> Dict[str, Any]:
@@ -59,13 +78,15 @@ class InternetExposureScanner(BaseScanner):
             # Determine ports to scan based on scan type
             ports_to_scan = self._get_scan_ports()
             
-            self.log_scan_info(f"Scanning {len(ports_to_scan)} ports using {'nmap' if self.use_nmap else 'Python sockets'}")
+            self.log_scan_info(f"Scanning {len(ports_to_scan)} ports using {self.scan_method}")
             
             # Perform port scan using appropriate method
             if self.use_nmap:
                 scan_results = self._perform_nmap_scan(ports_to_scan)
                 if scan_results:
                     self._extract_nmap_port_info(scan_results)
+            elif self.scan_method == "asyncio":
+                self._perform_asyncio_scan(ports_to_scan)
             else:
                 self._perform_socket_scan(ports_to_scan)
             
@@ -82,7 +103,7 @@ class InternetExposureScanner(BaseScanner):
                 "os_fingerprint": self.os_fingerprint,
                 "total_ports_scanned": len(ports_to_scan),
                 "scan_duration": self.get_scan_duration(),
-                "scan_method": "nmap" if self.use_nmap else "socket"
+                "scan_method": self.scan_method
             })
             
         except NetworkTimeoutError:
@@ -143,11 +164,13 @@ class InternetExposureScanner(BaseScanner):
                 self.nm.scan(
                     hosts=self.target,
                     ports=port_range,
-                    arguments=' '.join(scan_args)
+                    arguments=' '.join(scan_args),
+                    timeout=self.timeout
                 )
                 return self.nm.all_hosts()
             except Exception as e:
-                if "timed out" in str(e).lower():
+                # PortScannerTimeout reports "Timeout from nmap process"
+                if "timed out" in str(e).lower() or isinstance(e, nmap.PortScannerTimeout):
                     raise NetworkTimeoutError(f"Nmap scan timed out: {e}")
                 else:
                     raise ScanningNotPossibleError(f"Nmap scan failed: {e}")
@@ -165,6 +188,9 @@ class InternetExposureScanner(BaseScanner):
         """
         self.open_ports = []
         max_threads = min(50, len(ports))  # Limit concurrent connections
+        # Resolve once, not per port; connect_ex() on the name used the
+        # first IPv4 address too
+        address = self.resolve_target(socket.AF_INET)[0]
         
         def scan_port(port):
             """Scan a single port using socket connection."""
@@ -172,7 +198,7 @@ class InternetExposureScanner(BaseScanner):
                 sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                 sock.settimeout(3)  # 3 second timeout per port
                 
-                result = sock.connect_ex((self.target, port))
+                result = sock.connect_ex((address, port))
                 sock.close()
                 
                 if result == 0:  # Port is open
@@ -199,6 +225,55 @@ class InternetExposureScanner(BaseScanner):
         
         self.log_scan_info(f"Socket scan found {len(self.open_ports)} open ports")
     
+    def _perform_asyncio_scan(self, ports: List[int]) -> None:
+        """
+        Perform a TCP connect scan with asyncio, probing all ports at once.
+        
+        Args:
+            ports: List of ports to scan
+        """
+        address = self.resolve_target(socket.AF_INET)[0]
+        # Scanners run on worker threads, so this gets a loop of its own
+        self.open_ports = asyncio.run(self._asyncio_portscan(address, ports))
+        
+        self.log_scan_info(f"Asyncio scan found {len(self.open_ports)} open ports")
+    
+    async def _asyncio_portscan(self, address: str, ports: List[int]) -> List[Dict[str, Any]]:
+        """
+        Probe ports concurrently with asyncio.open_connection.
+        
+        Args:
+            address: IPv4 address to connect to
+            ports: List of ports to scan
+            
+        Returns:
+            list: Open port entries in scan order
+        """
+        semaphore = asyncio.Semaphore(self.ASYNC_MAX_CONNECTIONS)
+        
+        async def probe(port):
+            """Connect to a single port and close straight away."""
+            async with semaphore:
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection(address, port), self.ASYNC_CONNECT_TIMEOUT
+                )
+                writer.close()
+                return port
+        
+        results = await asyncio.gather(*[probe(port) for port in ports], return_exceptions=True)
+        
+        # Refused, unreachable and timed out ports all come back as exceptions
+        return [
+            {
+                "port": port,
+                "protocol": "tcp",
+                "service": self._guess_service_name(port),
+                "state": "open",
+                "method": "asyncio_connect"
+            }
+            for port in results if not isinstance(port, BaseException)
+        ]
+    
     def _guess_service_name(self, port: int) -> str:
         """
         Guess service name based on common port numbers.
@@ -292,7 +367,8 @@ class InternetExposureScanner(BaseScanner):
             # Run OS detection scan
             self.nm.scan(
                 hosts=self.target,
-                arguments=f'-O --osscan-limit --max-os-tries=1 --host-timeout={self.timeout}s'
+                arguments=f'-O --osscan-limit --max-os-tries=1 --host-timeout={self.timeout}s',
+                timeout=self.timeout
             )
             
             for host in self.nm.all_hosts():
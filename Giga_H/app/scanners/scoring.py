@@ -57,7 +57,51 @@ class ScoringEngine:
         """
         logger.info("Calculating security score and generating recommendations")
         
-        # Initialize scoring
+        final_score, category_scores, all_problems, all_recommendations = self._score_categories(scan_results)
+        
+        # Sort problems by severity and impact
+        sorted_problems = self._prioritize_problems(all_problems)
+        
+        # Generate summary recommendations (remove duplicates)
+        unique_recommendations = self._consolidate_recommendations(all_recommendations)
+        
+        # Generate scan summary
+        summary = self._generate_summary(scan_results, category_scores, sorted_problems)
+        
+        logger.info(f"Security score calculated: {final_score}/100 with {len(sorted_problems)} issues")
+        
+        return final_score, sorted_problems, unique_recommendations, summary
+    
+    def calculate_overall_score(self, scan_results: Dict[str, Any]) -> Tuple[int, Dict[str, int]]:
+        """
+        Calculate the overall score along with a score for each category.
+        
+        Both come from the same pass as calculate_score(), so the category
+        scores always agree with the overall one.
+        
+        Args:
+            scan_results: Complete scan results from all categories
+            
+        Returns:
+            tuple: (score, {category: score out of 100})
+        """
+        final_score, category_scores, _, _ = self._score_categories(scan_results)
+        
+        return final_score, {
+            category: int(100 * score / self.category_weights[category])
+            for category, score in category_scores.items()
+        }
+    
+    def _score_categories(self, scan_results: Dict[str, Any]) -> Tuple[int, Dict[str, float], List[Dict], List[Dict]]:
+        """
+        Score every category and total the deductions.
+        
+        Args:
+            scan_results: Complete scan results from all categories
+            
+        Returns:
+            tuple: (score, category scores out of their weight, problems, recommendations)
+        """
         total_score = 100
         all_problems = []
         all_recommendations = []
@@ -85,18 +129,7 @@ class ScoringEngine:
         # Ensure score stays within bounds
         final_score = max(0, min(100, int(total_score)))
         
-        # Sort problems by severity and impact
-        sorted_problems = self._prioritize_problems(all_problems)
-        
-        # Generate summary recommendations (remove duplicates)
-        unique_recommendations = self._consolidate_recommendations(all_recommendations)
-        
-        # Generate scan summary
-        summary = self._generate_summary(scan_results, category_scores, sorted_problems)
-        
-        logger.info(f"Security score calculated: {final_score}/100 with {len(sorted_problems)} issues")
-        
-        return final_score, sorted_problems, unique_recommendations, summary
+        return final_score, category_scores, all_problems, all_recommendations
     
     def _score_category(self, category: str, category_result: Dict[str, Any], max_weight: int) -> Tuple[int, List[Dict], List[Dict]]:
         """
@@ -664,3 +697,7 @@ class ScoringEngine:
             "medium_issues": severity_counts["medium"],
             "low_issues": severity_counts["low"]
         }
+
+
+# Global scoring engine instance; it holds only fixed weights, so it is safe to share
+scoring_engine = ScoringEngine()
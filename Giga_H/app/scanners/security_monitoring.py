@@ -6,7 +6,7 @@ from typing import Dict, List, Any, Optional
 import re
 import time
 
-from app.scanners.base import BaseScanner, NetworkTimeoutError, ScanningNotPossibleError
+from app.scanners.base import BaseScanner, NetworkTimeoutError, ScanningNotPossibleError, ScanContext
 from app.config import settings
 
 
@@ -20,8 +20,9 @@ class SecurityMonitoringScanner(BaseScanner):
     - Monitoring tool indicators
     """
     
-    def __init__(self, target: str, scan_type: str = "full"):
-        super().__init__(target, scan_type)
+    def __init__(self, target: str, scan_type: str = "full", timeout: Optional[int] = None,
+                 ctx: Optional[ScanContext] = None):
+        super().__init__(target, scan_type, timeout, ctx)
         self.results = {
             "waf_detected": False,
             "waf_type": None,
@@ -61,6 +62,18 @@ class SecurityMonitoringScanner(BaseScanner):
         """
         Perform security monitoring detection.
         
+        Returns:
+            dict: Security monitoring analysis results
+        """
+        return asyncio.run(self.scan_async())
+    
+    async def scan_async(self, session: Optional[aiohttp.ClientSession] = None) -> Dict[str, Any]:
+        """
+        Perform security monitoring detection on the running event loop.
+        
+        Args:
+            session: Shared HTTP session, or None to open a private one
+            
         Returns:
             dict: Security monitoring analysis results
         """
@@ -68,7 +81,7 @@ class SecurityMonitoringScanner(BaseScanner):
         
         try:
             # Run async scanning operations
-            asyncio.run(self._perform_security_scan())
+            await self._perform_security_scan(session)
             
             # Generate recommendations
             self._generate_recommendations()
@@ -82,27 +95,33 @@ class SecurityMonitoringScanner(BaseScanner):
         except Exception as e:
             return self.handle_network_error("security monitoring detection", str(e))
     
-    async def _perform_security_scan(self) -> None:
+    async def _perform_security_scan(self, session: Optional[aiohttp.ClientSession] = None) -> None:
         """
         Perform the main security monitoring detection operations.
+        
+        Args:
+            session: Shared HTTP session, or None to open a private one
         """
-        timeout = aiohttp.ClientTimeout(total=self.timeout)
-        connector = aiohttp.TCPConnector(ssl=False, limit=10)
-        
-        async with aiohttp.ClientSession(
-            timeout=timeout,
-            connector=connector,
-            headers={"User-Agent": "Security-Scanner/1.0"}
-        ) as session:
-            
-            # Detect WAF and security services
-            await self._detect_waf_and_security(session)
-            
-            # Test rate limiting
-            await self._test_rate_limiting(session)
+        if session is None:
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            connector = aiohttp.TCPConnector(ssl=False, limit=10)
             
-            # Check for monitoring tool indicators
-            await self._check_monitoring_indicators(session)
+            async with aiohttp.ClientSession(
+                timeout=timeout,
+                connector=connector,
+                headers={"User-Agent": "Security-Scanner/1.0"}
+            ) as session:
+                await self._perform_security_scan(session)
+            return
+        
+        # Detect WAF and security services
+        await self._detect_waf_and_security(session)
+        
+        # Test rate limiting
+        await self._test_rate_limiting(session)
+        
+        # Check for monitoring tool indicators
+        await self._check_monitoring_indicators(session)
     
     async def _detect_waf_and_security(self, session: aiohttp.ClientSession) -> None:
         """
@@ -263,14 +282,14 @@ class SecurityMonitoringScanner(BaseScanner):
         
         try:
             # Make rapid requests
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             for i in range(request_count):
                 try:
                     async with session.get(test_url) as response:
                         rapid_requests.append({
                             "status": response.status,
-                            "time": time.time() - start_time
+                            "time": time.perf_counter() - start_time
                         })
                         
                         # Check for rate limiting responses
@@ -10,6 +10,7 @@ from app.celery_app import celery_app
 from app.database import get_db_session
 from app.models import ScanRecord, ScanStatus
 from app.utils.logger import security_logger
+from app.utils.rate_limiter import release_scan_slot
 from app.scanners.internet_exposure import InternetExposureScanner
 from app.scanners.tls_security import TLSSecurityScanner
 from app.scanners.web_security import WebSecurityScanner
@@ -18,7 +19,7 @@ from app.scanners.cve_vulnerabilities import CVEVulnerabilityScanner
 from app.scanners.iam_assessment import IAMAssessmentScanner
 from app.scanners.backup_dr import BackupDRScanner
 from app.scanners.security_monitoring import SecurityMonitoringScanner
-from app.scanners.scoring import ScoringEngine
+from app.scanners.scoring import scoring_engine
 
 
 @celery_app.task(bind=True, name="perform_scan")
@@ -32,6 +33,7 @@ def perform_scan(self, scan_id: str, target: str, scan_type: str):
         scan_type: Type of scan (quick, full, custom)
     """
     start_time = datetime.utcnow()
+    client_ip = None
     
     try:
         # Update scan status to running
@@ -56,7 +58,6 @@ def perform_scan(self, scan_id: str, target: str, scan_type: str):
         scan_results = run_comprehensive_scan(target, scan_type, self)
         
         # Calculate scoring and summary
-        scoring_engine = ScoringEngine()
         score, problems, recommendations, summary = scoring_engine.calculate_score(scan_results)
         
         # Update scan record with results
@@ -109,6 +110,10 @@ def perform_scan(self, scan_id: str, target: str, scan_type: str):
         
         # Re-raise exception for Celery
         raise Exception(f"Scan failed: {error_message}")
+    
+    finally:
+        # Free the concurrent slot taken when the API accepted the scan
+        release_scan_slot(client_ip)
 
 
 def run_comprehensive_scan(target: str, scan_type: str, task=None) -> Dict[str, Any]:
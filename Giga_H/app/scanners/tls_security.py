@@ -10,7 +10,7 @@ from cryptography import x509
 from cryptography.hazmat.backends import default_backend
 import OpenSSL
 
-from app.scanners.base import BaseScanner, NetworkTimeoutError, ScanningNotPossibleError
+from app.scanners.base import BaseScanner, NetworkTimeoutError, ScanningNotPossibleError, ScanContext
 from app.config import settings
 
 
@@ -23,8 +23,9 @@ class TLSSecurityScanner(BaseScanner):
     - HSTS header checking
     """
     
-    def __init__(self, target: str, scan_type: str = "full"):
-        super().__init__(target, scan_type)
+    def __init__(self, target: str, scan_type: str = "full", timeout: Optional[int] = None,
+                 ctx: Optional[ScanContext] = None):
+        super().__init__(target, scan_type, timeout, ctx)
         self.tls_ports = [443, 993, 995, 465, 587, 636, 989, 990]
         self.results = {
             "tls_versions": [],
@@ -40,25 +41,36 @@ class TLSSecurityScanner(BaseScanner):
         """
         Perform TLS/SSL security scanning.
         
+        Returns:
+            dict: TLS security analysis results
+        """
+        return asyncio.run(self.scan_async())
+    
+    async def scan_async(self, session: Optional[aiohttp.ClientSession] = None) -> Dict[str, Any]:
+        """
+        Perform TLS/SSL security scanning on the running event loop.
+        
+        The handshake tests use blocking sockets and run on a worker thread;
+        only the HSTS check goes through the HTTP session.
+        
+        Args:
+            session: Shared HTTP session, or None to open a private one
+            
         Returns:
             dict: TLS security analysis results
         """
         self.start_scan()
         
         try:
-            # Find TLS-enabled services
-            tls_services = self._find_tls_services()
+            # Find and test TLS-enabled services
+            tls_services = await asyncio.to_thread(self._analyze_tls_services)
             
             if not tls_services:
                 return self.handle_service_not_found("TLS/SSL services")
             
-            # Test each TLS service found
-            for service in tls_services:
-                self._analyze_tls_service(service['port'])
-            
             # Check HSTS if web service is available
             if any(port in [443, 8443] for port in [s['port'] for s in tls_services]):
-                asyncio.run(self._check_hsts())
+                await self._check_hsts(session)
             
             return self.create_result("completed", self.results)
             
@@ -69,6 +81,20 @@ class TLSSecurityScanner(BaseScanner):
         except Exception as e:
             return self.handle_network_error("TLS/SSL analysis", str(e))
     
+    def _analyze_tls_services(self) -> List[Dict[str, Any]]:
+        """
+        Find TLS-enabled services and test each one.
+        
+        Returns:
+            list: The TLS services that were found and analyzed
+        """
+        tls_services = self._find_tls_services()
+        
+        for service in tls_services:
+            self._analyze_tls_service(service['port'])
+        
+        return tls_services
+    
     def _find_tls_services(self) -> List[Dict[str, Any]]:
         """
         Find TLS-enabled services on the target.
@@ -112,7 +138,7 @@ class TLSSecurityScanner(BaseScanner):
             context.check_hostname = False
             context.verify_mode = ssl.CERT_NONE
             
-            with socket.create_connection((self.target, port), timeout) as sock:
+            with self.connect_target(port, timeout) as sock:
                 with context.wrap_socket(sock, server_hostname=self.target) as ssock:
                     return True
                     
@@ -193,7 +219,7 @@ class TLSSecurityScanner(BaseScanner):
                     context.minimum_version = ssl.TLSVersion.TLSv1_3
                     context.maximum_version = ssl.TLSVersion.TLSv1_3
                 
-                with socket.create_connection((self.target, port), timeout=self.timeout) as sock:
+                with self.connect_target(port, self.timeout) as sock:
                     with context.wrap_socket(sock, server_hostname=self.target) as ssock:
                         supported_versions.append(version_name)
                         self.log_scan_info(f"TLS version {version_name} supported")
@@ -230,7 +256,7 @@ class TLSSecurityScanner(BaseScanner):
             context.check_hostname = False
             context.verify_mode = ssl.CERT_NONE
             
-            with socket.create_connection((self.target, port), timeout=self.timeout) as sock:
+            with self.connect_target(port, self.timeout) as sock:
                 with context.wrap_socket(sock, server_hostname=self.target) as ssock:
                     # Get certificate in DER format
                     der_cert = ssock.getpeercert(binary_form=True)
@@ -362,7 +388,7 @@ class TLSSecurityScanner(BaseScanner):
             context.check_hostname = False
             context.verify_mode = ssl.CERT_NONE
             
-            with socket.create_connection((self.target, port), timeout=self.timeout) as sock:
+            with self.connect_target(port, self.timeout) as sock:
                 with context.wrap_socket(sock, server_hostname=self.target) as ssock:
                     cipher = ssock.cipher()
                     if cipher:
@@ -386,46 +412,52 @@ class TLSSecurityScanner(BaseScanner):
         except Exception as e:
             self.log_scan_info(f"Cipher suite testing failed: {e}")
     
-    async def _check_hsts(self) -> None:
+    async def _check_hsts(self, session: Optional[aiohttp.ClientSession] = None) -> None:
         """
         Check for HSTS (HTTP Strict Transport Security) header.
+        
+        Args:
+            session: Shared HTTP session, or None to open a private one
         """
         try:
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.timeout),
-                connector=aiohttp.TCPConnector(ssl=False)
-            ) as session:
-                
-                # Try HTTPS first
-                url = f"https://{self.target}"
-                
-                try:
-                    async with session.get(url) as response:
-                        hsts_header = response.headers.get('Strict-Transport-Security')
-                        
-                        if hsts_header:
-                            self.results["hsts_enabled"] = True
-                            
-                            # Parse max-age
-                            if "max-age=" in hsts_header:
-                                max_age_str = hsts_header.split("max-age=")[1].split(";")[0]
-                                try:
-                                    self.results["hsts_max_age"] = int(max_age_str)
-                                except ValueError:
-                                    pass
-                            
-                            self.log_scan_info(f"HSTS enabled: {hsts_header}")
-                        else:
-                            self.results["hsts_enabled"] = False
-                            self.results["vulnerabilities"].append({
-                                "type": "missing_hsts",
-                                "severity": "low",
-                                "description": "HSTS header not configured",
-                                "recommendation": "Enable HTTP Strict Transport Security"
-                            })
-                            
-                except Exception as e:
-                    self.log_scan_info(f"HSTS check failed: {e}")
+            if session is None:
+                async with aiohttp.ClientSession(
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                    connector=aiohttp.TCPConnector(ssl=False)
+                ) as session:
+                    await self._check_hsts(session)
+                return
+            
+            # Try HTTPS first
+            url = f"https://{self.target}"
+            
+            try:
+                async with session.get(url) as response:
+                    hsts_header = response.headers.get('Strict-Transport-Security')
                     
+                    if hsts_header:
+                        self.results["hsts_enabled"] = True
+                        
+                        # Parse max-age
+                        if "max-age=" in hsts_header:
+                            max_age_str = hsts_header.split("max-age=")[1].split(";")[0]
+                            try:
+                                self.results["hsts_max_age"] = int(max_age_str)
+                            except ValueError:
+                                pass
+                        
+                        self.log_scan_info(f"HSTS enabled: {hsts_header}")
+                    else:
+                        self.results["hsts_enabled"] = False
+                        self.results["vulnerabilities"].append({
+                            "type": "missing_hsts",
+                            "severity": "low",
+                            "description": "HSTS header not configured",
+                            "recommendation": "Enable HTTP Strict Transport Security"
+                        })
+                        
+            except Exception as e:
+                self.log_scan_info(f"HSTS check failed: {e}")
+                
         except Exception as e:
             self.log_scan_info(f"HSTS analysis failed: {e}")
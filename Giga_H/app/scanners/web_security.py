@@ -6,7 +6,7 @@ from typing import Dict, List, Any, Optional
 from urllib.parse import urlparse, urljoin
 import re
 
-from app.scanners.base import BaseScanner, NetworkTimeoutError, ScanningNotPossibleError
+from app.scanners.base import BaseScanner, NetworkTimeoutError, ScanningNotPossibleError, ScanContext
 from app.config import settings
 
 
@@ -19,8 +19,9 @@ class WebSecurityScanner(BaseScanner):
     - Basic web application security assessment
     """
     
-    def __init__(self, target: str, scan_type: str = "full"):
-        super().__init__(target, scan_type)
+    def __init__(self, target: str, scan_type: str = "full", timeout: Optional[int] = None,
+                 ctx: Optional[ScanContext] = None):
+        super().__init__(target, scan_type, timeout, ctx)
         self.results = {
             "https_redirect": False,
             "security_headers": {},
@@ -46,6 +47,18 @@ class WebSecurityScanner(BaseScanner):
         """
         Perform web security headers scanning.
         
+        Returns:
+            dict: Web security analysis results
+        """
+        return asyncio.run(self.scan_async())
+    
+    async def scan_async(self, session: Optional[aiohttp.ClientSession] = None) -> Dict[str, Any]:
+        """
+        Perform web security headers scanning on the running event loop.
+        
+        Args:
+            session: Shared HTTP session, or None to open a private one
+            
         Returns:
             dict: Web security analysis results
         """
@@ -53,7 +66,7 @@ class WebSecurityScanner(BaseScanner):
         
         try:
             # Run async scanning operations
-            asyncio.run(self._perform_web_scan())
+            await self._perform_web_scan(session)
             
             # Calculate security score
             self._calculate_security_score()
@@ -67,33 +80,39 @@ class WebSecurityScanner(BaseScanner):
         except Exception as e:
             return self.handle_network_error("web security analysis", str(e))
     
-    async def _perform_web_scan(self) -> None:
+    async def _perform_web_scan(self, session: Optional[aiohttp.ClientSession] = None) -> None:
         """
         Perform the main web security scanning operations.
+        
+        Args:
+            session: Shared HTTP session, or None to open a private one
         """
-        # Configure aiohttp session with custom settings
-        timeout = aiohttp.ClientTimeout(total=self.timeout)
-        connector = aiohttp.TCPConnector(
-            ssl=False,  # Allow invalid SSL for testing
-            limit=10,
-            ttl_dns_cache=300
-        )
-        
-        async with aiohttp.ClientSession(
-            timeout=timeout,
-            connector=connector,
-            headers={"User-Agent": "CyberScanner/1.0"}
-        ) as session:
-            
-            # Test HTTPS redirect
-            await self._test_https_redirect(session)
-            
-            # Analyze security headers on HTTPS endpoint
-            await self._analyze_security_headers(session)
+        if session is None:
+            # Configure aiohttp session with custom settings
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            connector = aiohttp.TCPConnector(
+                ssl=False,  # Allow invalid SSL for testing
+                limit=10,
+                ttl_dns_cache=300
+            )
             
-            # Additional web security tests for full scans
-            if not self.should_scan_quickly():
-                await self._test_additional_security(session)
+            async with aiohttp.ClientSession(
+                timeout=timeout,
+                connector=connector,
+                headers={"User-Agent": "CyberScanner/1.0"}
+            ) as session:
+                await self._perform_web_scan(session)
+            return
+        
+        # Test HTTPS redirect
+        await self._test_https_redirect(session)
+        
+        # Analyze security headers on HTTPS endpoint
+        await self._analyze_security_headers(session)
+        
+        # Additional web security tests for full scans
+        if not self.should_scan_quickly():
+            await self._test_additional_security(session)
     
     async def _test_https_redirect(self, session: aiohttp.ClientSession) -> None:
         """
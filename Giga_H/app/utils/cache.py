@@ -0,0 +1,80 @@
+"""In-process caching utilities for API responses."""
+
+import time
+import threading
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Small thread-safe cache whose entries expire after a fixed time.
+    
+    Entries are kept in insertion order, so when the cache is full the
+    oldest one is evicted. Process-local: with several API workers each
+    keeps its own copy.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize cache.
+        
+        Args:
+            maxsize: Maximum number of entries
+            ttl: Seconds an entry stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires, value = entry
+        if expires < time.monotonic():
+            self.pop(key)
+            return None
+        
+        return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Cache a value for the configured TTL.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            entries = self._entries
+            entries.pop(key, None)
+            if len(entries) >= self.maxsize:
+                # Evict the oldest entry; insertion order is expiry order
+                del entries[next(iter(entries))]
+            entries[key] = (time.monotonic() + self.ttl, value)
+    
+    def pop(self, key: Hashable) -> None:
+        """
+        Remove a cached value, if present.
+        
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Remove all cached values."""
+        with self._lock:
+            self._entries.clear()
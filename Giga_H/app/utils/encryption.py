@@ -2,8 +2,9 @@
 
 import os
 import json
-import base64
-from typing import Dict, Any, Optional
+import binascii
+import hashlib
+from typing import Dict, List, Any, Optional, Tuple
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
@@ -29,26 +30,27 @@ class DataEncryption:
         """
         if encryption_key:
             self.key = encryption_key.encode()
+            self.cipher_suite = Fernet(self.key)
         else:
-            # Generate key from environment or create new one
-            self.key = self._get_or_generate_key()
-        
-        self.cipher_suite = Fernet(self.key)
+            # Use key from environment or create new one
+            self.key, self.cipher_suite = self._get_or_generate_cipher()
     
-    def _get_or_generate_key(self) -> bytes:
+    def _get_or_generate_cipher(self) -> Tuple[bytes, Fernet]:
         """
-        Get encryption key from environment or generate new one.
+        Build the cipher from the environment key or a newly generated one.
+        
+        Constructing the Fernet instance doubles as key validation, so each
+        key is only parsed once.
         
         Returns:
-            bytes: Encryption key
+            tuple: (encryption key, cipher suite)
         """
         env_key = settings.ENCRYPTION_KEY
         
         if env_key:
             try:
-                # Verify key format
-                Fernet(env_key.encode())
-                return env_key.encode()
+                key = env_key.encode()
+                return key, Fernet(key)
             except Exception as e:
                 logger.warning(f"Invalid encryption key in environment: {e}")
         
@@ -62,7 +64,7 @@ class DataEncryption:
             f"{new_key.decode()}"
         )
         
-        return new_key
+        return new_key, Fernet(new_key)
     
     def encrypt_scan_data(self, data: Dict[str, Any]) -> str:
         """
@@ -80,7 +82,7 @@ class DataEncryption:
             encrypted_data = self.cipher_suite.encrypt(json_data.encode())
             
             # Return base64 encoded for database storage
-            return base64.b64encode(encrypted_data).decode()
+            return binascii.b2a_base64(encrypted_data, newline=False).decode("ascii")
             
         except Exception as e:
             logger.error(f"Failed to encrypt scan data: {e}")
@@ -98,7 +100,7 @@ class DataEncryption:
         """
         try:
             # Decode base64 and decrypt
-            encrypted_bytes = base64.b64decode(encrypted_data.encode())
+            encrypted_bytes = binascii.a2b_base64(encrypted_data)
             decrypted_data = self.cipher_suite.decrypt(encrypted_bytes)
             
             # Parse JSON
@@ -120,7 +122,7 @@ class DataEncryption:
         """
         try:
             encrypted_data = self.cipher_suite.encrypt(value.encode())
-            return base64.b64encode(encrypted_data).decode()
+            return binascii.b2a_base64(encrypted_data, newline=False).decode("ascii")
         except Exception as e:
             logger.error(f"Failed to encrypt field: {e}")
             raise EncryptionError(f"Field encryption failed: {e}")
@@ -136,7 +138,7 @@ class DataEncryption:
             str: Decrypted value
         """
         try:
-            encrypted_bytes = base64.b64decode(encrypted_value.encode())
+            encrypted_bytes = binascii.a2b_base64(encrypted_value)
             decrypted_data = self.cipher_suite.decrypt(encrypted_bytes)
             return decrypted_data.decode()
         except Exception as e:
@@ -189,6 +191,52 @@ class DataEncryption:
         
         return anonymized
     
+    def create_anonymized_data_bulk(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create anonymized versions of many scan records for analytics export.
+        
+        Produces the same output as calling create_anonymized_data on each
+        record, but hashes every distinct target/email/IP only once since the
+        same client or domain typically appears across many scans.
+        
+        Args:
+            records: Original scan data records
+        
+        Returns:
+            list: Anonymized scan data records
+        """
+        target_cache: Dict[str, str] = {}
+        hash_cache: Dict[str, str] = {}
+        anonymize_target = self._anonymize_target
+        anonymize_scan_results = self._anonymize_scan_results
+        sha256 = hashlib.sha256
+        
+        anonymized_records = []
+        for record in records:
+            anonymized = record.copy()
+            
+            if "target" in anonymized:
+                target = anonymized["target"]
+                cached = target_cache.get(target)
+                if cached is None:
+                    cached = target_cache[target] = anonymize_target(target)
+                anonymized["target"] = cached
+            
+            for field in ("email", "client_ip"):
+                if field in anonymized:
+                    value = str(anonymized[field])
+                    cached = hash_cache.get(value)
+                    if cached is None:
+                        cached = hash_cache[value] = sha256(value.encode()).hexdigest()[:16]
+                    anonymized[field] = cached
+            
+            if "scan_results" in anonymized:
+                anonymized["scan_results"] = anonymize_scan_results(anonymized["scan_results"])
+            
+            anonymized_records.append(anonymized)
+        
+        return anonymized_records
+    
     def _anonymize_target(self, target: str) -> str:
         """
         Anonymize target while preserving useful structure.
@@ -199,16 +247,17 @@ class DataEncryption:
         Returns:
             str: Anonymized target
         """
+        # First 4 digest bytes == first 8 hex chars of generate_data_hash()
+        target_hash = hashlib.sha256(target.encode()).digest()[:4].hex()
+        
         # Hash the target but keep domain structure
-        if "." in target:
-            parts = target.split(".")
-            if len(parts) >= 2:
-                # Keep TLD, hash the rest
-                domain_hash = self.generate_data_hash(target)[:8]
-                return f"anonymous-{domain_hash}.{parts[-1]}"
+        idx = target.rfind(".")
+        if idx >= 0:
+            # Keep TLD, hash the rest
+            return f"anonymous-{target_hash}.{target[idx + 1:]}"
         
-        # For IPs or single words, just return a hash
-        return f"target-{self.generate_data_hash(target)[:8]}"
+        # For single words, just return a hash
+        return f"target-{target_hash}"
     
     def _anonymize_scan_results(self, scan_results: Dict[str, Any]) -> Dict[str, Any]:
         """
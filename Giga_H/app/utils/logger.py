@@ -3,27 +3,425 @@
 import logging
 import json
 import os
-from datetime import datetime
-from logging.handlers import RotatingFileHandler
+import re
+import sys
+import threading
+import time
+import weakref
+from logging.handlers import RotatingFileHandler, MemoryHandler
+from typing import Callable, Dict, List
 from app.config import settings
 
+# Buffered file handlers and how often they are flushed to bound data loss
+LOG_BUFFER_CAPACITY = 1024
+LOG_FLUSH_INTERVAL = 0.5  # seconds
+
+_buffered_handlers = []
+_flusher_lock = threading.Lock()
+_flusher = None
+
+# The one handler per log file shared by every logger writing it, by path
+_shared_file_handlers: Dict[str, "FastFileHandler"] = {}
+_shared_file_handlers_lock = threading.Lock()
+
+# (UTC second, "YYYY-MM-DDTHH:MM:SS" for that second)
+_timestamp_cache = (-1, "")
+
+
+def utc_iso(timestamp: float) -> str:
+    """
+    Format a time.time() value as UTC ISO 8601 with milliseconds.
+    
+    The date and time part comes from time.strftime and is only rebuilt
+    when the second changes; each call just appends the milliseconds.
+    """
+    global _timestamp_cache
+    
+    second = int(timestamp)
+    cached_second, prefix = _timestamp_cache
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _timestamp_cache = (second, prefix)
+    return f"{prefix}.{int(timestamp * 1000) % 1000:03d}"
+
+
+def utc_now_iso() -> str:
+    """Return the current UTC time in ISO 8601 format with milliseconds."""
+    return utc_iso(time.time())
+
+
+def _flush_buffered_handlers():
+    """Periodically push buffered records to their file handlers."""
+    while True:
+        time.sleep(LOG_FLUSH_INTERVAL)
+        for handler in list(_buffered_handlers) + list(_shared_file_handlers.values()):
+            try:
+                handler.flush()
+            except Exception as e:
+                # Not through logging: the failing handler may be the one
+                # that would carry the message
+                sys.stderr.write(f"Log buffer flush failed for {handler.target!r}: {e!r}\n")
+
+
+def _start_flusher():
+    """Start the background thread that flushes buffered handlers."""
+    global _flusher
+    
+    _flusher = threading.Thread(target=_flush_buffered_handlers, name="log-flusher", daemon=True)
+    _flusher.start()
+
+
+def _restart_flusher_after_fork():
+    """Give a forked child (e.g. a Celery prefork worker) its own flusher."""
+    global _flusher_lock, _flusher, _shared_file_handlers_lock
+    
+    # Threads don't survive fork(), and the lock may have been held mid-fork
+    _flusher_lock = threading.Lock()
+    _flusher = None
+    # Records buffered before the fork belong to the parent, which writes
+    # them itself; flushing the copies here would log them twice
+    for handler in _buffered_handlers:
+        handler.buffer = []
+    _shared_file_handlers_lock = threading.Lock()
+    if _buffered_handlers or _shared_file_handlers:
+        _start_flusher()
+
+
+if hasattr(os, "register_at_fork"):  # Not available on Windows
+    os.register_at_fork(after_in_child=_restart_flusher_after_fork)
+
+
+def buffered_handler(target: logging.Handler, flush_level: int = logging.ERROR) -> MemoryHandler:
+    """
+    Wrap a file handler so records are written in batches.
+    
+    Records are held in memory until the buffer fills, a record at
+    flush_level or above arrives, or the periodic flusher runs. Rotation
+    checks on the target therefore happen once per batch instead of once
+    per record. Pending records are written by logging.shutdown() at exit.
+    
+    Args:
+        target: Handler that performs the actual write
+        flush_level: Minimum level that is written through immediately
+        
+    Returns:
+        MemoryHandler: Buffering handler to attach to a logger
+    """
+    handler = MemoryHandler(LOG_BUFFER_CAPACITY, flushLevel=flush_level, target=target)
+    _buffered_handlers.append(handler)
+    
+    with _flusher_lock:
+        if _flusher is None:
+            _start_flusher()
+    
+    return handler
+
+
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+
+
+def _write_chunks(fd: int, chunks: List[bytes]) -> None:
+    """Write every chunk to fd with as few syscalls as possible."""
+    if not hasattr(os, "writev"):
+        data = memoryview(b"".join(chunks))
+        while data:
+            data = data[os.write(fd, data):]
+        return
+    
+    while chunks:
+        batch = chunks[:_IOV_MAX]
+        written = os.writev(fd, batch)
+        # Drop fully written chunks and trim a partially written one
+        done = 0
+        for chunk in batch:
+            if written < len(chunk):
+                break
+            written -= len(chunk)
+            done += 1
+        chunks = chunks[done:]
+        if written:
+            chunks[0] = chunks[0][written:]
+
+
+_FIELD_RE = re.compile(r'%\((\w+)\)[sd]')
+
+
+def _compile_template(fmt: str) -> Callable[[logging.LogRecord, str], str]:
+    """Compile a %-style log format into a function of (record, asctime)."""
+    parts = []
+    pos = 0
+    for match in _FIELD_RE.finditer(fmt):
+        if match.start() > pos:
+            parts.append(repr(fmt[pos:match.start()].replace('%%', '%')))
+        name = match.group(1)
+        if name == 'asctime':
+            parts.append('asctime')
+        elif name == 'message':
+            parts.append('record.message')
+        else:
+            parts.append(f'str(record.{name})')
+        pos = match.end()
+    if pos < len(fmt):
+        parts.append(repr(fmt[pos:].replace('%%', '%')))
+    
+    source = f"def template(record, asctime):\n    return {' + '.join(parts) or repr('')}\n"
+    namespace = {}
+    exec(source, namespace)
+    return namespace['template']
+
+
+class TemplateFormatter(logging.Formatter):
+    """
+    Formatter that compiles its format string into a plain concatenation.
+    
+    Produces the same lines as logging.Formatter for simple records without
+    re-parsing the format on every call, and formats the date part of
+    asctime once per second. Records carrying exception or stack info use
+    the standard path.
+    """
+    
+    def __init__(self, fmt: str):
+        super().__init__(fmt)
+        self._template = _compile_template(fmt)
+        self._second = (None, '')
+    
+    def format(self, record: logging.LogRecord) -> str:
+        if record.exc_info or record.exc_text or record.stack_info:
+            return super().format(record)
+        
+        record.message = record.getMessage()
+        
+        second, prefix = self._second
+        if int(record.created) != second:
+            prefix = time.strftime(self.default_time_format, self.converter(record.created))
+            self._second = (int(record.created), prefix)
+        record.asctime = self.default_msec_format % (prefix, record.msecs)
+        
+        return self._template(record, record.asctime)
+
+
+class FastFileHandler(logging.Handler):
+    """
+    Append-only file handler writing straight to an O_APPEND descriptor.
+    
+    Unlike RotatingFileHandler it does not stat the file on every record;
+    a background timer checks the size and rotates out-of-band. Records are
+    collected until they add up to a few filesystem blocks, or the handler
+    is flushed, and then written with a single writev().
+    
+    If another process has already rotated the file, the handler just
+    reopens it. Forked children get their own rotation timer. Records at
+    flush_level or above are written out immediately.
+    """
+    
+    def __init__(self, filename, max_bytes: int = 0, backup_count: int = 0, check_interval: float = 10.0,
+                 flush_level: int = logging.CRITICAL + 1):
+        super().__init__()
+        self.baseFilename = os.fspath(filename)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.check_interval = check_interval
+        self.flush_level = flush_level
+        self.fd = self._open()
+        
+        try:
+            self._block_size = os.statvfs(os.path.dirname(self.baseFilename) or ".").f_bsize * 4
+        except (AttributeError, OSError):
+            self._block_size = 64 * 1024
+        self._chunks: List[bytes] = []
+        self._pending = 0
+        
+        self._timer = None
+        if max_bytes > 0:
+            self._schedule_rotation_check()
+        _fast_handlers.add(self)
+    
+    def _open(self) -> int:
+        return os.open(self.baseFilename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            chunk = (self.format(record) + "\n").encode()
+            self._chunks.append(chunk)
+            self._pending += len(chunk)
+            if self._pending >= self._block_size or record.levelno >= self.flush_level:
+                self._write_buffer()
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if self._chunks and self.fd >= 0:
+                self._write_buffer()
+        finally:
+            self.release()
+    
+    def _write_buffer(self) -> None:
+        """Write out every pending record (handler lock held)."""
+        chunks = self._chunks
+        self._chunks = []
+        self._pending = 0
+        _write_chunks(self.fd, chunks)
+    
+    def _schedule_rotation_check(self) -> None:
+        self._timer = threading.Timer(self.check_interval, self._check_rotation)
+        self._timer.daemon = True
+        self._timer.start()
+    
+    def _after_fork_in_child(self) -> None:
+        """Drop the parent's unwritten records and restart the timer."""
+        self._chunks = []
+        self._pending = 0
+        if self.max_bytes > 0 and self.fd >= 0:
+            self._schedule_rotation_check()
+    
+    def _check_rotation(self) -> None:
+        try:
+            st = os.fstat(self.fd)
+            try:
+                current = os.stat(self.baseFilename)
+                moved = (current.st_ino, current.st_dev) != (st.st_ino, st.st_dev)
+            except FileNotFoundError:
+                moved = True
+            
+            if moved or st.st_size >= self.max_bytes:
+                self.acquire()
+                try:
+                    if moved:
+                        # Rotated by another worker process; follow it
+                        self._reopen()
+                    else:
+                        self._rotate()
+                finally:
+                    self.release()
+        except Exception:
+            pass  # Keep logging to the current file; retry next interval
+        finally:
+            if self.fd >= 0:
+                self._schedule_rotation_check()
+    
+    def _rotate(self) -> None:
+        """Shift backups up by one and reopen the base file (handler lock held)."""
+        if self._chunks:
+            self._write_buffer()
+        
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                source = f"{self.baseFilename}.{i}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.baseFilename}.{i + 1}")
+            os.replace(self.baseFilename, f"{self.baseFilename}.1")
+        else:
+            os.truncate(self.baseFilename, 0)
+        
+        self._reopen()
+    
+    def _reopen(self) -> None:
+        """Switch to a freshly opened base file (handler lock held)."""
+        if self._chunks:
+            self._write_buffer()
+        old_fd, self.fd = self.fd, self._open()
+        os.close(old_fd)
+    
+    def close(self) -> None:
+        self.acquire()
+        try:
+            if self._timer is not None:
+                self._timer.cancel()
+            if self.fd >= 0:
+                if self._chunks:
+                    self._write_buffer()
+                os.close(self.fd)
+                self.fd = -1
+        finally:
+            self.release()
+        super().close()
+
+
+_fast_handlers = weakref.WeakSet()
+
+
+def _reinit_fast_handlers_after_fork() -> None:
+    for handler in list(_fast_handlers):
+        handler._after_fork_in_child()
+
+
+if hasattr(os, "register_at_fork"):  # Not available on Windows
+    os.register_at_fork(after_in_child=_reinit_fast_handlers_after_fork)
+
+
+class TagFilter(logging.Filter):
+    """Stamp records with the short tag of the logger that produced them."""
+    
+    def __init__(self, tag: str):
+        super().__init__()
+        self.tag = tag
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.log_tag = self.tag
+        return True
+
+
+def shared_file_handler(filename, max_bytes: int, backup_count: int) -> FastFileHandler:
+    """
+    Get the handler that writes and rotates a log file shared by several loggers.
+    
+    Every logger writing the file gets the same handler, so within a process
+    the file has a single descriptor, lock and rotator. Loggers add a
+    TagFilter so their lines stay distinguishable. Warnings and above are
+    written immediately; the rest are flushed with the buffered handlers.
+    
+    Args:
+        filename: Log file path
+        max_bytes: Size at which the file is rotated
+        backup_count: Number of rotated files to keep
+        
+    Returns:
+        FastFileHandler: Handler formatting '<time> | <tag> | <level> | <message>'
+    """
+    path = os.path.abspath(filename)
+    
+    with _shared_file_handlers_lock:
+        handler = _shared_file_handlers.get(path)
+        if handler is None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            handler = FastFileHandler(path, max_bytes, backup_count, flush_level=logging.WARNING)
+            handler.setFormatter(TemplateFormatter(
+                '%(asctime)s | %(log_tag)s | %(levelname)s | %(message)s'
+            ))
+            _shared_file_handlers[path] = handler
+    
+    with _flusher_lock:
+        if _flusher is None:
+            _start_flusher()
+    
+    return handler
+
 
 def setup_logging():
     """Configure application logging with rotation for cost efficiency."""
     # Create logs directory if it doesn't exist
     os.makedirs(settings.LOG_DIR, exist_ok=True)
     
+    file_handler = RotatingFileHandler(
+        os.path.join(settings.LOG_DIR, "app.log"),
+        maxBytes=10*1024*1024,  # 10MB
+        backupCount=5
+    )
+    # Buffered records are formatted by the target, not the MemoryHandler
+    file_handler.setFormatter(logging.Formatter(settings.LOG_FORMAT))
+    
     # Configure root logger
     logging.basicConfig(
         level=getattr(logging, settings.LOG_LEVEL),
         format=settings.LOG_FORMAT,
         handlers=[
             logging.StreamHandler(),  # Console output
-            RotatingFileHandler(
-                os.path.join(settings.LOG_DIR, "app.log"),
-                maxBytes=10*1024*1024,  # 10MB
-                backupCount=5
-            )
+            buffered_handler(file_handler)
         ]
     )
 
@@ -34,18 +432,15 @@ class SecurityLogger:
     def __init__(self):
         self.logger = logging.getLogger('security_scanner')
         
-        # Create security log file handler
-        security_handler = RotatingFileHandler(
+        # security.log is also written by multi_logger's security and audit
+        # loggers; sharing one handler keeps a single writer and rotator.
+        # Vulnerabilities, violations and incidents are written immediately
+        self.logger.addFilter(TagFilter('SECURITY'))
+        self.logger.addHandler(shared_file_handler(
             os.path.join(settings.LOG_DIR, "security.log"),
-            maxBytes=50*1024*1024,  # 50MB
-            backupCount=10
-        )
-        
-        security_handler.setFormatter(
-            logging.Formatter('%(asctime)s - SECURITY - %(levelname)s - %(message)s')
-        )
-        
-        self.logger.addHandler(security_handler)
+            max_bytes=50*1024*1024,  # 50MB
+            backup_count=10
+        ))
         self.logger.setLevel(logging.INFO)
     
     def log_scan_start(self, target: str, client_ip: str, scan_id: str, scan_type: str):
@@ -56,7 +451,7 @@ class SecurityLogger:
             'target': target,
             'client_ip': client_ip,
             'scan_type': scan_type,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': utc_now_iso()
         }))
     
     def log_scan_complete(self, scan_id: str, target: str, duration: float, issues_found: int):
@@ -67,7 +462,7 @@ class SecurityLogger:
             'target': target,
             'duration_seconds': duration,
             'issues_found': issues_found,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': utc_now_iso()
         }))
     
     def log_scan_failed(self, scan_id: str, target: str, error: str):
@@ -77,7 +472,7 @@ class SecurityLogger:
             'scan_id': scan_id,
             'target': target,
             'error': error,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': utc_now_iso()
         }))
     
     def log_vulnerability_found(self, scan_id: str, target: str, vulnerability: dict):
@@ -89,7 +484,7 @@ class SecurityLogger:
             'cve': vulnerability.get('cve_id'),
             'severity': vulnerability.get('severity'),
             'service': vulnerability.get('service'),
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': utc_now_iso()
         }))
     
     def log_rate_limit_exceeded(self, client_ip: str, endpoint: str):
@@ -98,7 +493,7 @@ class SecurityLogger:
             'event': 'rate_limit_exceeded',
             'client_ip': client_ip,
             'endpoint': endpoint,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': utc_now_iso()
         }))
     
     def log_security_incident(self, incident_type: str, details: dict):
@@ -107,7 +502,7 @@ class SecurityLogger:
             'event': 'security_incident',
             'incident_type': incident_type,
             'details': details,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': utc_now_iso()
         }))
 
 
@@ -6,15 +6,436 @@ This module provides multiple specialized loggers for different aspects
 of the cybersecurity scanning system.
 """
 
+import atexit
+import itertools
 import logging
-import json
 import os
-from datetime import datetime
-from logging.handlers import RotatingFileHandler
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Hashable, Iterable, Optional, Tuple
+
+import orjson
+
+try:
+    import msgspec
+except ImportError:  # Fall back to orjson alone
+    msgspec = None
 
 from app.config import settings
+from app.utils.logger import (
+    FastFileHandler, TagFilter, TemplateFormatter, shared_file_handler, utc_iso, utc_now_iso
+)
+
+
+def _orjson_encode(entry: Any) -> str:
+    return orjson.dumps(entry, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+if msgspec is not None:
+    # Reused encoder: record layouts are resolved once per class, not per call
+    _msgspec_encode = msgspec.json.Encoder(enc_hook=str).encode
+    
+    def _encode(entry: Any) -> str:
+        """Serialize a log entry to compact JSON."""
+        try:
+            return _msgspec_encode(entry).decode()
+        except Exception:
+            # e.g. dict keys msgspec cannot encode; orjson stringifies them
+            return _orjson_encode(entry)
+else:
+    _encode = _orjson_encode
+
+
+# Fixed-shape log entries. orjson serializes slotted dataclasses directly,
+# so the hot paths never build a dict; field order is the JSON key order.
+
+@dataclass(slots=True)
+class SecurityEventRecord:
+    event: str
+    timestamp: str
+    details: Dict[str, Any]
+
+
+@dataclass(slots=True)
+class AppStartupRecord:
+    event: str
+    version: str
+    config: Dict[str, Any]
+    timestamp: str
+
+
+@dataclass(slots=True)
+class AppShutdownRecord:
+    event: str
+    reason: str
+    timestamp: str
+
+
+@dataclass(slots=True)
+class ComponentStatusRecord:
+    event: str
+    component: str
+    status: str
+    details: str
+    timestamp: str
+
+
+@dataclass(slots=True)
+class ScanDetailRecord:
+    scan_id: str
+    scanner: str
+    target: str
+    action: str
+    result: Any
+    timestamp: str
+
+
+@dataclass(slots=True)
+class PortScanRecord:
+    scan_id: str
+    target: str
+    port: int
+    service: str
+    status: str
+    timestamp: str
+
+
+@dataclass(slots=True)
+class RateLimitRecord:
+    event: str
+    client_ip: str
+    endpoint: str
+    limit: int
+    timestamp: str
+
+
+@dataclass(slots=True)
+class DataAccessRecord:
+    event: str
+    user_id: str
+    action: str
+    resource: str
+    client_ip: str
+    timestamp: str
+
+
+@dataclass(slots=True)
+class ConfigChangeRecord:
+    event: str
+    user_id: str
+    setting: str
+    old_value: str
+    new_value: str
+    timestamp: str
+
+
+@dataclass(slots=True)
+class PerformanceMetricRecord:
+    metric: str
+    value: float
+    unit: str
+    timestamp: str
+
+
+@dataclass(slots=True)
+class ScanTimingRecord:
+    scan_id: str
+    scanner: str
+    duration_seconds: float
+    timestamp: str
+
+
+@dataclass(slots=True)
+class ErrorRecord:
+    error_type: str
+    message: str
+    details: Dict[str, Any]
+    timestamp: str
+
+
+# Shared by error records logged without details; never mutated
+_NO_DETAILS: Dict[str, Any] = {}
+
+
+def _as_dict(entry: Any) -> Dict[str, Any]:
+    """Copy a log entry (dict or slotted record) into a new dict."""
+    if isinstance(entry, dict):
+        return dict(entry)
+    return {name: getattr(entry, name) for name in entry.__slots__}
+
+
+def _port_scan_key(entry: Any) -> Optional[Hashable]:
+    """Collapse key for port scan results: same scan, target, service and status."""
+    if type(entry) is not PortScanRecord:
+        return None
+    return (entry.scan_id, entry.target, entry.service, entry.status)
+
+
+class _Run:
+    """A run of consecutive log entries that share a collapse key."""
+    
+    __slots__ = ('key', 'level', 'started', 'count', 'values', 'last')
+    
+    def __init__(self, key: Hashable, level: int, started: float):
+        self.key = key
+        self.level = level
+        self.started = started
+        self.count = 0
+        self.values = []
+        self.last = None
+
+
+class _RecordRing:
+    """
+    Fixed-size ring of preallocated record slots for one hot log method.
+    
+    Writers claim a slot from an atomic counter and overwrite its fields in
+    place, so logging a record allocates no dict. The last value of every
+    record is a time.time() float that the reader turns into 'timestamp'.
+    A slot's sequence number is stored last and marks it complete; if
+    writers lap the reader, the overwritten records are dropped.
+    """
+    
+    def __init__(self, logger: logging.Logger, level: int, fields: tuple, size: int = 4096):
+        self.logger = logger
+        self.level = level
+        self.fields = fields + ('timestamp',)
+        self.size = size
+        self._slots = [[-1] + [None] * len(self.fields) for _ in range(size)]
+        self._claim = itertools.count()  # next() is atomic under the GIL
+        self._next = 0
+    
+    def put(self, *values) -> None:
+        """Store a record; values are the fields followed by time.time()."""
+        seq = next(self._claim)
+        slot = self._slots[seq % self.size]
+        slot[0] = -1
+        slot[1:] = values
+        slot[0] = seq
+    
+    def skip_pending(self) -> None:
+        """Forget records written before now (e.g. a forked child's copy)."""
+        seq = next(self._claim)
+        self._claim = itertools.count(seq + 1)
+        self._next = seq + 1
+    
+    def drain(self):
+        """Yield completed records as dicts, in order (writer thread only)."""
+        slots = self._slots
+        size = self.size
+        fields = self.fields
+        while True:
+            slot = slots[self._next % size]
+            seq = slot[0]
+            if seq < self._next:
+                return  # Not written yet
+            if seq > self._next:
+                # Lapped: skip ahead to the record now in this slot
+                self._next = seq
+            values = slot[1:]
+            if slot[0] != seq:
+                continue  # Overwritten while copying; retry this slot
+            self._next += 1
+            
+            entry = dict(zip(fields, values))
+            entry['timestamp'] = utc_iso(entry['timestamp'])
+            yield entry
+
+
+class _LogQueue:
+    """
+    Per-thread log record buffers drained by a single background writer.
+    
+    Callers only append (logger, level, entry) tuples to a deque owned by
+    their thread, so they never contend on handler locks or pay for JSON
+    encoding. The writer thread encodes the entries and emits them through
+    the regular loggers. Hot paths may pass the entry as a raw
+    (record class, *fields, time.time()) tuple; the writer builds the
+    record and formats the timestamp.
+    
+    Loggers can register a collapse callback: consecutive entries that map
+    to the same key are written once, followed by a single summary entry
+    carrying a 'repeated' count when the run ends.
+    
+    Buffers of threads that have exited are dropped once drained, and a
+    forked child (e.g. a Celery prefork worker) starts its own writer.
+    """
+    
+    def __init__(self, flush_interval: float = 0.05):
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._buffers = []
+        self._buffers_lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._collapse = {}
+        self._runs = {}
+        self._rings = []
+        
+        self._start_writer()
+        atexit.register(self.drain, True)
+        if hasattr(os, "register_at_fork"):  # Not available on Windows
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+    
+    def _start_writer(self) -> None:
+        self._writer = threading.Thread(target=self._run, name="multi-logger-writer", daemon=True)
+        self._writer.start()
+    
+    def _after_fork_in_child(self) -> None:
+        """Reset state inherited from the parent and restart the writer."""
+        # Locks may have been held mid-fork; queued entries and open runs
+        # belong to the parent, which writes them itself
+        self._local = threading.local()
+        self._buffers = []
+        self._buffers_lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._runs = {}
+        for ring in self._rings:
+            ring.skip_pending()
+        self._start_writer()
+    
+    def collapse(self, logger: logging.Logger, key: Callable[[Dict[str, Any]], Optional[Hashable]],
+                 collect: Optional[str] = None, window: float = 30.0) -> None:
+        """
+        Collapse consecutive identical entries written to a logger.
+        
+        Args:
+            logger: Logger whose entries should be collapsed
+            key: Returns the collapse key for an entry, or None to never collapse it
+            collect: Entry field whose values are gathered into '<collect>s' in the summary
+            window: Maximum age of a run in seconds before it is summarized
+        """
+        self._collapse[logger] = (key, collect, window)
+    
+    def ring(self, logger: logging.Logger, level: int, fields: tuple, size: int = 4096) -> _RecordRing:
+        """Create a preallocated record ring drained along with the queue."""
+        ring = _RecordRing(logger, level, fields, size)
+        self._rings.append(ring)
+        return ring
+    
+    def put(self, logger: logging.Logger, level: int, entry: Any) -> None:
+        """Queue a log entry from the calling thread."""
+        try:
+            buffer = self._local.buffer
+        except AttributeError:
+            buffer = self._local.buffer = deque()
+            with self._buffers_lock:
+                self._buffers.append((threading.current_thread(), buffer))
+        buffer.append((logger, level, entry))
+    
+    def put_many(self, logger: logging.Logger, level: int, entries: Iterable[Any]) -> None:
+        """Queue several log entries from the calling thread in one go."""
+        try:
+            buffer = self._local.buffer
+        except AttributeError:
+            buffer = self._local.buffer = deque()
+            with self._buffers_lock:
+                self._buffers.append((threading.current_thread(), buffer))
+        buffer.extend((logger, level, entry) for entry in entries)
+    
+    def drain(self, end_runs: bool = False) -> None:
+        """Write every queued entry, visiting thread buffers round-robin."""
+        with self._drain_lock:
+            with self._buffers_lock:
+                buffers = list(self._buffers)
+            
+            now = time.monotonic()
+            written = set()
+            finished = False
+            for thread, buffer in buffers:
+                popleft = buffer.popleft
+                while buffer:
+                    logger, level, entry = popleft()
+                    if type(entry) is tuple:
+                        entry = entry[0](*entry[1:-1], utc_iso(entry[-1]))
+                    written.add(logger)
+                    self._write(logger, level, entry, now)
+                if not thread.is_alive():
+                    finished = True
+            
+            # A dead thread can't append again, so its drained buffer can go
+            if finished:
+                with self._buffers_lock:
+                    self._buffers = [
+                        (thread, buffer) for thread, buffer in self._buffers
+                        if buffer or thread.is_alive()
+                    ]
+            
+            for ring in self._rings:
+                for entry in ring.drain():
+                    written.add(ring.logger)
+                    self._write(ring.logger, ring.level, entry, now)
+            
+            # Summarize runs that have outlived their window
+            for logger, run in list(self._runs.items()):
+                if end_runs or now - run.started >= self._collapse[logger][2]:
+                    self._end_run(logger)
+                    written.add(logger)
+            
+            # Push out whatever the file handlers are still buffering
+            for logger in written:
+                for handler in logger.handlers:
+                    try:
+                        handler.flush()
+                    except Exception:
+                        pass
+    
+    def _write(self, logger: logging.Logger, level: int, entry: Any, now: float) -> None:
+        collapse = self._collapse.get(logger)
+        if collapse is not None:
+            key_func, collect, window = collapse
+            try:
+                key = key_func(entry)
+            except Exception:
+                key = None
+            
+            run = self._runs.get(logger)
+            if run is not None:
+                if key is not None and key == run.key and level == run.level and now - run.started < window:
+                    run.count += 1
+                    if collect is not None:
+                        run.values.append(getattr(entry, collect))
+                    run.last = entry
+                    return
+                self._end_run(logger)
+            
+            if key is not None:
+                self._runs[logger] = _Run(key, level, now)
+        
+        self._emit(logger, level, entry)
+    
+    def _end_run(self, logger: logging.Logger) -> None:
+        run = self._runs.pop(logger)
+        if not run.count:
+            return
+        
+        summary = _as_dict(run.last)
+        summary['repeated'] = run.count
+        collect = self._collapse[logger][1]
+        if collect is not None:
+            del summary[collect]
+            summary[collect + 's'] = run.values
+        self._emit(logger, run.level, summary)
+    
+    @staticmethod
+    def _emit(logger: logging.Logger, level: int, entry: Any) -> None:
+        try:
+            logger.log(level, _encode(entry))
+        except Exception:
+            pass  # Never let one bad entry stop the writer
+    
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.drain()
+            except Exception as e:
+                # This is the only writer, so it must outlive a bad drain; the
+                # error goes to stderr since the loggers are what just failed
+                sys.stderr.write(f"multi_logger writer: drain failed: {e!r}\n")
 
 
 class MultiLoggerSystem:
@@ -27,6 +448,10 @@ class MultiLoggerSystem:
         self.log_dir = Path(settings.LOG_DIR)
         self.log_dir.mkdir(exist_ok=True)
         
+        # Entries are encoded and written off the calling thread
+        self._queue = _LogQueue()
+        self._put = self._queue.put
+        
         # Initialize all loggers
         self.security_logger = self._setup_security_logger()
         self.application_logger = self._setup_application_logger()
@@ -35,26 +460,32 @@ class MultiLoggerSystem:
         self.audit_logger = self._setup_audit_logger()
         self.performance_logger = self._setup_performance_logger()
         self.error_logger = self._setup_error_logger()
+        
+        # Logged on every HTTP request, so recorded without a dict per call
+        self._api_ring = self._queue.ring(
+            self.api_logger, logging.INFO,
+            ('method', 'endpoint', 'client_ip', 'user_agent', 'status_code')
+        )
+        
+        # Closed-port sweeps log one line per run instead of one per port
+        self._queue.collapse(self.scan_logger, _port_scan_key, collect='port')
     
     def _create_rotating_handler(self, filename: str, max_bytes: int = 10*1024*1024, backup_count: int = 5):
         """Create a rotating file handler."""
-        return RotatingFileHandler(
+        return FastFileHandler(
             self.log_dir / filename,
-            maxBytes=max_bytes,
-            backupCount=backup_count
+            max_bytes=max_bytes,
+            backup_count=backup_count
         )
     
     def _setup_security_logger(self):
         """Security events, access control, authentication."""
         logger = logging.getLogger('security')
         logger.setLevel(logging.INFO)
+        logger.addFilter(TagFilter('SECURITY'))
         
-        handler = self._create_rotating_handler('security.log', 50*1024*1024, 10)
-        handler.setFormatter(logging.Formatter(
-            '%(asctime)s | SECURITY | %(levelname)s | %(message)s'
-        ))
-        
-        logger.addHandler(handler)
+        # Same file and handler as logger.SecurityLogger, so one writer rotates it
+        logger.addHandler(shared_file_handler(self.log_dir / 'security.log', 50*1024*1024, 10))
         return logger
     
     def _setup_application_logger(self):
@@ -63,7 +494,7 @@ class MultiLoggerSystem:
         logger.setLevel(logging.INFO)
         
         handler = self._create_rotating_handler('application.log')
-        handler.setFormatter(logging.Formatter(
+        handler.setFormatter(TemplateFormatter(
             '%(asctime)s | APP | %(levelname)s | %(message)s'
         ))
         
@@ -76,7 +507,7 @@ class MultiLoggerSystem:
         logger.setLevel(logging.DEBUG)
         
         handler = self._create_rotating_handler('scan.log', 100*1024*1024, 20)
-        handler.setFormatter(logging.Formatter(
+        handler.setFormatter(TemplateFormatter(
             '%(asctime)s | SCAN | %(levelname)s | %(message)s'
         ))
         
@@ -89,7 +520,7 @@ class MultiLoggerSystem:
         logger.setLevel(logging.INFO)
         
         handler = self._create_rotating_handler('api.log', 30*1024*1024, 15)
-        handler.setFormatter(logging.Formatter(
+        handler.setFormatter(TemplateFormatter(
             '%(asctime)s | API | %(levelname)s | %(message)s'
         ))
         
@@ -100,13 +531,10 @@ class MultiLoggerSystem:
         """Compliance, user actions, data access."""
         logger = logging.getLogger('audit')
         logger.setLevel(logging.INFO)
+        logger.addFilter(TagFilter('AUDIT'))
         
-        handler = self._create_rotating_handler('audit.log', 50*1024*1024, 10)
-        handler.setFormatter(logging.Formatter(
-            '%(asctime)s | AUDIT | %(levelname)s | %(message)s'
-        ))
-        
-        logger.addHandler(handler)
+        # Same size and retention as security.log, so share its file and handler
+        logger.addHandler(shared_file_handler(self.log_dir / 'security.log', 50*1024*1024, 10))
         return logger
     
     def _setup_performance_logger(self):
@@ -115,7 +543,7 @@ class MultiLoggerSystem:
         logger.setLevel(logging.INFO)
         
         handler = self._create_rotating_handler('performance.log')
-        handler.setFormatter(logging.Formatter(
+        handler.setFormatter(TemplateFormatter(
             '%(asctime)s | PERF | %(levelname)s | %(message)s'
         ))
         
@@ -128,7 +556,7 @@ class MultiLoggerSystem:
         logger.setLevel(logging.ERROR)
         
         handler = self._create_rotating_handler('error.log', 20*1024*1024, 10)
-        handler.setFormatter(logging.Formatter(
+        handler.setFormatter(TemplateFormatter(
             '%(asctime)s | ERROR | %(levelname)s | %(message)s | %(pathname)s:%(lineno)d'
         ))
         
@@ -138,15 +566,17 @@ class MultiLoggerSystem:
     # Security Logging Methods
     def log_security_event(self, event_type: str, details: Dict[str, Any]):
         """Log security-related events."""
-        log_entry = {
-            'event': event_type,
-            'timestamp': datetime.utcnow().isoformat(),
-            'details': details
-        }
-        self.security_logger.info(json.dumps(log_entry))
+        if not self.security_logger.isEnabledFor(logging.INFO):
+            return
+        
+        self._put(self.security_logger, logging.INFO,
+                  SecurityEventRecord(event_type, utc_now_iso(), details))
     
     def log_scan_started(self, target: str, scan_id: str, client_ip: str, scan_type: str):
         """Log when a scan starts."""
+        if not self.security_logger.isEnabledFor(logging.INFO):
+            return
+        
         self.log_security_event('scan_started', {
             'scan_id': scan_id,
             'target': target,
@@ -156,6 +586,9 @@ class MultiLoggerSystem:
     
     def log_scan_completed(self, scan_id: str, target: str, duration: float, issues_found: int):
         """Log when a scan completes."""
+        if not self.security_logger.isEnabledFor(logging.INFO):
+            return
+        
         self.log_security_event('scan_completed', {
             'scan_id': scan_id,
             'target': target,
@@ -165,6 +598,9 @@ class MultiLoggerSystem:
     
     def log_vulnerability_detected(self, scan_id: str, target: str, vulnerability: Dict[str, Any]):
         """Log vulnerability detection."""
+        if not self.security_logger.isEnabledFor(logging.INFO):
+            return
+        
         self.log_security_event('vulnerability_detected', {
             'scan_id': scan_id,
             'target': target,
@@ -174,148 +610,131 @@ class MultiLoggerSystem:
     # Application Logging Methods
     def log_app_startup(self, version: str, config: Dict[str, Any]):
         """Log application startup."""
-        log_entry = {
-            'event': 'app_startup',
-            'version': version,
-            'config': config,
-            'timestamp': datetime.utcnow().isoformat()
-        }
-        self.application_logger.info(json.dumps(log_entry))
+        if not self.application_logger.isEnabledFor(logging.INFO):
+            return
+        
+        self._put(self.application_logger, logging.INFO,
+                  AppStartupRecord('app_startup', version, config, utc_now_iso()))
     
     def log_app_shutdown(self, reason: str = "normal"):
         """Log application shutdown."""
-        log_entry = {
-            'event': 'app_shutdown',
-            'reason': reason,
-            'timestamp': datetime.utcnow().isoformat()
-        }
-        self.application_logger.info(json.dumps(log_entry))
+        if not self.application_logger.isEnabledFor(logging.INFO):
+            return
+        
+        self._put(self.application_logger, logging.INFO,
+                  AppShutdownRecord('app_shutdown', reason, utc_now_iso()))
     
     def log_component_status(self, component: str, status: str, details: str = ""):
         """Log component status changes."""
-        log_entry = {
-            'event': 'component_status',
-            'component': component,
-            'status': status,
-            'details': details,
-            'timestamp': datetime.utcnow().isoformat()
-        }
-        self.application_logger.info(json.dumps(log_entry))
+        if not self.application_logger.isEnabledFor(logging.INFO):
+            return
+        
+        self._put(self.application_logger, logging.INFO,
+                  ComponentStatusRecord('component_status', component, status, details, utc_now_iso()))
     
     # Scan Logging Methods
+    # Called from scanner threads, so these queue raw tuples and leave
+    # building the record and its timestamp to the writer thread
     def log_scan_detail(self, scan_id: str, scanner: str, target: str, action: str, result: Any):
         """Log detailed scan activities."""
-        log_entry = {
-            'scan_id': scan_id,
-            'scanner': scanner,
-            'target': target,
-            'action': action,
-            'result': result,
-            'timestamp': datetime.utcnow().isoformat()
-        }
-        self.scan_logger.debug(json.dumps(log_entry))
+        if not self.scan_logger.isEnabledFor(logging.DEBUG):
+            return
+        
+        self._put(self.scan_logger, logging.DEBUG,
+                  (ScanDetailRecord, scan_id, scanner, target, action, result, time.time()))
     
     def log_port_scan_result(self, scan_id: str, target: str, port: int, service: str, status: str):
         """Log port scan results."""
-        log_entry = {
-            'scan_id': scan_id,
-            'target': target,
-            'port': port,
-            'service': service,
-            'status': status,
-            'timestamp': datetime.utcnow().isoformat()
-        }
-        self.scan_logger.info(json.dumps(log_entry))
+        if not self.scan_logger.isEnabledFor(logging.INFO):
+            return
+        
+        self._put(self.scan_logger, logging.INFO,
+                  (PortScanRecord, scan_id, target, port, service, status, time.time()))
     
     # API Logging Methods
     def log_api_request(self, method: str, endpoint: str, client_ip: str, user_agent: str, status_code: int = None):
         """Log API requests."""
-        log_entry = {
-            'method': method,
-            'endpoint': endpoint,
-            'client_ip': client_ip,
-            'user_agent': user_agent,
-            'status_code': status_code,
-            'timestamp': datetime.utcnow().isoformat()
-        }
-        self.api_logger.info(json.dumps(log_entry))
+        if not self.api_logger.isEnabledFor(logging.INFO):
+            return
+        
+        self._api_ring.put(method, endpoint, client_ip, user_agent, status_code, time.time())
     
     def log_rate_limit_hit(self, client_ip: str, endpoint: str, limit: int):
         """Log rate limiting events."""
-        log_entry = {
-            'event': 'rate_limit_exceeded',
-            'client_ip': client_ip,
-            'endpoint': endpoint,
-            'limit': limit,
-            'timestamp': datetime.utcnow().isoformat()
-        }
-        self.api_logger.warning(json.dumps(log_entry))
+        if not self.api_logger.isEnabledFor(logging.WARNING):
+            return
+        
+        self._put(self.api_logger, logging.WARNING,
+                  RateLimitRecord('rate_limit_exceeded', client_ip, endpoint, limit, utc_now_iso()))
     
     # Audit Logging Methods
     def log_data_access(self, user_id: str, action: str, resource: str, client_ip: str):
         """Log data access for compliance."""
-        log_entry = {
-            'event': 'data_access',
-            'user_id': user_id,
-            'action': action,
-            'resource': resource,
-            'client_ip': client_ip,
-            'timestamp': datetime.utcnow().isoformat()
-        }
-        self.audit_logger.info(json.dumps(log_entry))
+        if not self.audit_logger.isEnabledFor(logging.INFO):
+            return
+        
+        self._put(self.audit_logger, logging.INFO,
+                  DataAccessRecord('data_access', user_id, action, resource, client_ip, utc_now_iso()))
     
     def log_configuration_change(self, user_id: str, setting: str, old_value: str, new_value: str):
         """Log configuration changes."""
-        log_entry = {
-            'event': 'config_change',
-            'user_id': user_id,
-            'setting': setting,
-            'old_value': old_value,
-            'new_value': new_value,
-            'timestamp': datetime.utcnow().isoformat()
-        }
-        self.audit_logger.warning(json.dumps(log_entry))
+        if not self.audit_logger.isEnabledFor(logging.WARNING):
+            return
+        
+        self._put(self.audit_logger, logging.WARNING,
+                  ConfigChangeRecord('config_change', user_id, setting, old_value, new_value, utc_now_iso()))
     
     # Performance Logging Methods
     def log_performance_metric(self, metric_name: str, value: float, unit: str = ""):
         """Log performance metrics."""
-        log_entry = {
-            'metric': metric_name,
-            'value': value,
-            'unit': unit,
-            'timestamp': datetime.utcnow().isoformat()
-        }
-        self.performance_logger.info(json.dumps(log_entry))
+        if not self.performance_logger.isEnabledFor(logging.INFO):
+            return
+        
+        self._put(self.performance_logger, logging.INFO,
+                  PerformanceMetricRecord(metric_name, value, unit, utc_now_iso()))
     
     def log_scan_timing(self, scan_id: str, scanner: str, duration: float):
         """Log scan timing information."""
-        log_entry = {
-            'scan_id': scan_id,
-            'scanner': scanner,
-            'duration_seconds': duration,
-            'timestamp': datetime.utcnow().isoformat()
-        }
-        self.performance_logger.info(json.dumps(log_entry))
+        if not self.performance_logger.isEnabledFor(logging.INFO):
+            return
+        
+        self._put(self.performance_logger, logging.INFO,
+                  (ScanTimingRecord, scan_id, scanner, duration, time.time()))
+    
+    def log_scan_timings(self, scan_id: str, timings: Iterable[Tuple[str, float]]):
+        """Log the timings of several scanners at once, e.g. at the end of a scan."""
+        if not self.performance_logger.isEnabledFor(logging.INFO):
+            return
+        
+        now = time.time()
+        self._queue.put_many(self.performance_logger, logging.INFO, [
+            (ScanTimingRecord, scan_id, scanner, duration, now) for scanner, duration in timings
+        ])
     
     # Error Logging Methods
     def log_error(self, error_type: str, message: str, details: Dict[str, Any] = None):
         """Log errors and exceptions."""
-        log_entry = {
-            'error_type': error_type,
-            'message': message,
-            'details': details or {},
-            'timestamp': datetime.utcnow().isoformat()
-        }
-        self.error_logger.error(json.dumps(log_entry))
+        if not self.error_logger.isEnabledFor(logging.ERROR):
+            return
+        
+        self._put(self.error_logger, logging.ERROR,
+                  ErrorRecord(error_type, message, details or _NO_DETAILS, utc_now_iso()))
     
     def log_scan_error(self, scan_id: str, scanner: str, target: str, error: str):
         """Log scan-specific errors."""
+        if not self.error_logger.isEnabledFor(logging.ERROR):
+            return
+        
         self.log_error('scan_error', f"Scanner {scanner} failed for target {target}", {
             'scan_id': scan_id,
             'scanner': scanner,
             'target': target,
             'error': error
         })
+    
+    def flush(self):
+        """Write out every queued record now, e.g. before shutdown."""
+        self._queue.drain(end_runs=True)
 
 
 # Global multi-logger instance
@@ -1,10 +1,125 @@
 """Rate limiting implementation for cost efficiency and abuse prevention."""
 
 import time
-import os
-from typing import Dict
+import socket
+import logging
+from typing import Dict, List, Tuple
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Maximum number of token buckets / cached keys kept per process
+LOCAL_BUCKET_CAPACITY = 10000
+
+
+# Atomically check the hourly and concurrent scan limits and, if both
+# allow it, record the scan start. Returns 1 when the scan may start.
+# KEYS: hourly key, concurrent key
+# ARGV: max scans per hour, max concurrent scans, concurrent key TTL
+TRY_START_SCAN_SCRIPT = """
+local hourly = tonumber(redis.call('GET', KEYS[1]) or '0')
+if hourly >= tonumber(ARGV[1]) then
+    return 0
+end
+local concurrent = tonumber(redis.call('GET', KEYS[2]) or '0')
+if concurrent >= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], 3600)
+redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return 1
+"""
+
+# Decrement the concurrent scan counter without going below zero.
+# KEYS: concurrent key
+RELEASE_SCAN_SCRIPT = """
+local concurrent = tonumber(redis.call('GET', KEYS[1]) or '0')
+if concurrent > 0 then
+    return redis.call('DECR', KEYS[1])
+end
+return 0
+"""
+
+# Count a request in a fixed-window counter, setting the expiry on the
+# first request of the window. Returns the request count so far.
+# KEYS: window key
+# ARGV: window length in seconds
+COUNT_REQUEST_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
+
+def _create_redis_pool(redis):
+    """
+    Create a Redis connection pool from the configured connection settings.
+    
+    Uses a Unix domain socket when REDIS_UNIX_SOCKET is set (Redis on
+    the same host, configured with `unixsocket`), otherwise REDIS_URL
+    over TCP with keepalive so idle pooled connections stay usable.
+    
+    Args:
+        redis: The redis.asyncio module for the API, or redis for blocking callers
+    """
+    if settings.REDIS_UNIX_SOCKET:
+        return redis.ConnectionPool(
+            connection_class=redis.UnixDomainSocketConnection,
+            path=settings.REDIS_UNIX_SOCKET,
+            max_connections=settings.REDIS_MAX_CONNECTIONS
+        )
+    
+    keepalive_options = {}
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        keepalive_options[socket.TCP_KEEPIDLE] = 60
+    
+    return redis.ConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        socket_keepalive=True,
+        socket_keepalive_options=keepalive_options
+    )
+
+
+# Blocking client for release_scan_slot(), created on first use
+_sync_redis_client = None
+_sync_release_scan = None
+
+
+def _concurrent_scan_key(client_ip: str) -> bytes:
+    """Build the concurrent scan counter key for a client."""
+    return f"concurrent_scans:{client_ip}".encode()
+
+
+def release_scan_slot(client_ip: str) -> None:
+    """
+    Record that a scan has ended, from synchronous code (Celery tasks).
+    
+    The API takes the slot via RateLimiter.try_start_scan(); the worker
+    running the scan gives it back here whether the scan succeeded or not.
+    Failures are logged, never raised, so they can't fail the task.
+    
+    Args:
+        client_ip: Client IP address the scan was started for
+    """
+    global _sync_redis_client, _sync_release_scan
+    
+    if settings.DEMO_MODE or not client_ip:
+        return
+    
+    try:
+        if _sync_redis_client is None:
+            import redis
+            _sync_redis_client = redis.Redis(connection_pool=_create_redis_pool(redis))
+            _sync_release_scan = _sync_redis_client.register_script(RELEASE_SCAN_SCRIPT)
+        _sync_release_scan(keys=[_concurrent_scan_key(client_ip)])
+    except Exception as e:
+        logger.warning(f"Failed to release scan slot for {client_ip}: {e}")
+
 
 class DemoRateLimiter:
     """In-memory rate limiter for demo mode."""
@@ -20,6 +135,10 @@ class DemoRateLimiter:
         """Allow all scans in demo mode."""
         return True
     
+    def try_start_scan(self, client_ip: str) -> bool:
+        """Allow all scans in demo mode."""
+        return True
+    
     def record_scan_start(self, client_ip: str) -> None:
         """Record scan start (no-op in demo)."""
         pass
@@ -34,17 +153,26 @@ class DemoRateLimiter:
 
 
 class RateLimiter:
-    """Redis-based rate limiter for API endpoints and scanning requests."""
+    """
+    Redis-based rate limiter for API endpoints and scanning requests.
+    
+    Uses the asyncio Redis client with a shared connection pool so limit
+    checks never block the event loop; all public methods are coroutines.
+    """
     
     def __init__(self):
         # Use demo rate limiter if in demo mode or Redis not available
-        if os.getenv("DEMO_MODE", "false").lower() == "true":
+        if settings.DEMO_MODE:
             self._use_demo = True
             self._demo_limiter = DemoRateLimiter()
         else:
             try:
-                import redis
-                self.redis_client = redis.from_url(settings.REDIS_URL)
+                import redis.asyncio as redis
+                self.redis_client = redis.Redis(connection_pool=_create_redis_pool(redis))
+                # Sent via EVALSHA, falling back to EVAL if not yet cached
+                self._try_start_scan = self.redis_client.register_script(TRY_START_SCAN_SCRIPT)
+                self._count_request = self.redis_client.register_script(COUNT_REQUEST_SCRIPT)
+                self._release_scan = self.redis_client.register_script(RELEASE_SCAN_SCRIPT)
                 self._use_demo = False
             except (ImportError, Exception):
                 self._use_demo = True
@@ -53,8 +181,17 @@ class RateLimiter:
         self.max_scans_per_hour = settings.MAX_SCANS_PER_HOUR
         self.max_concurrent_scans = settings.MAX_CONCURRENT_SCANS
         self.rate_limit_window = settings.RATE_LIMIT_WINDOW
+        self._rl_requests = settings.RATE_LIMIT_REQUESTS
+        self._scan_timeout = settings.DEFAULT_SCAN_TIMEOUT
         
-    def can_start_scan(self, client_ip: str) -> bool:
+        # Per-process token buckets: (client_ip, endpoint) -> [tokens, last_refill]
+        self._local_buckets: Dict[Tuple[str, str], List[float]] = {}
+        self._refill_rate = self._rl_requests / self.rate_limit_window
+        
+        # client_ip -> (hour, hourly scan key, concurrent scan key)
+        self._key_cache: Dict[str, Tuple[int, bytes, bytes]] = {}
+        
+    async def can_start_scan(self, client_ip: str) -> bool:
         """
         Check if client can start a new scan based on rate limits.
         
@@ -67,25 +204,52 @@ class RateLimiter:
         if self._use_demo:
             return self._demo_limiter.can_start_scan(client_ip)
         
-        current_time = int(time.time())
+        hourly_scans, concurrent_scans = await self._scan_counts(client_ip)
+        return self._within_scan_limits(hourly_scans, concurrent_scans)
+    
+    async def _scan_counts(self, client_ip: str) -> Tuple[int, int]:
+        """
+        Fetch the hourly and concurrent scan counters in one round-trip.
         
-        # Check hourly scan limit
-        hourly_key = f"scan_limit:{client_ip}:{current_time // 3600}"
-        current_scans = self.redis_client.get(hourly_key)
+        Args:
+            client_ip: Client IP address
+            
+        Returns:
+            tuple: (hourly scans, concurrent scans)
+        """
+        hourly_scans, concurrent_scans = await self.redis_client.mget(self._scan_keys(client_ip))
+        return int(hourly_scans or 0), int(concurrent_scans or 0)
+    
+    def _within_scan_limits(self, hourly_scans: int, concurrent_scans: int) -> bool:
+        """Check scan counters against the hourly and concurrent limits."""
+        return hourly_scans < self.max_scans_per_hour and concurrent_scans < self.max_concurrent_scans
+    
+    async def try_start_scan(self, client_ip: str) -> bool:
+        """
+        Check the scan limits and record the scan start in one round-trip.
         
-        if current_scans and int(current_scans) >= self.max_scans_per_hour:
-            return False
+        The check and the increments run atomically on the Redis server, so
+        concurrent requests cannot both pass the limit check. Prefer this
+        over calling can_start_scan() followed by record_scan_start().
         
-        # Check concurrent scan limit
-        concurrent_key = f"concurrent_scans:{client_ip}"
-        concurrent_scans = self.redis_client.get(concurrent_key)
+        Args:
+            client_ip: Client IP address
+            
+        Returns:
+            bool: True if the scan was recorded and may start, False otherwise
+        """
+        if self._use_demo:
+            return self._demo_limiter.try_start_scan(client_ip)
         
-        if concurrent_scans and int(concurrent_scans) >= self.max_concurrent_scans:
-            return False
+        hourly_key, concurrent_key = self._scan_keys(client_ip)
         
-        return True
+        allowed = await self._try_start_scan(
+            keys=[hourly_key, concurrent_key],
+            args=[self.max_scans_per_hour, self.max_concurrent_scans, self._scan_timeout]
+        )
+        return allowed == 1
     
-    def record_scan_start(self, client_ip: str) -> None:
+    async def record_scan_start(self, client_ip: str) -> None:
         """
         Record that a scan has started for rate limiting.
         
@@ -95,22 +259,20 @@ class RateLimiter:
         if self._use_demo:
             return self._demo_limiter.record_scan_start(client_ip)
         
-        current_time = int(time.time())
+        hourly_key, concurrent_key = self._scan_keys(client_ip)
         
         # Increment hourly counter
-        hourly_key = f"scan_limit:{client_ip}:{current_time // 3600}"
         pipeline = self.redis_client.pipeline()
         pipeline.incr(hourly_key)
         pipeline.expire(hourly_key, 3600)  # Expire after 1 hour
         
         # Increment concurrent counter
-        concurrent_key = f"concurrent_scans:{client_ip}"
         pipeline.incr(concurrent_key)
-        pipeline.expire(concurrent_key, settings.DEFAULT_SCAN_TIMEOUT)  # Expire after scan timeout
+        pipeline.expire(concurrent_key, self._scan_timeout)  # Expire after scan timeout
         
-        pipeline.execute()
+        await pipeline.execute()
     
-    def record_scan_end(self, client_ip: str) -> None:
+    async def record_scan_end(self, client_ip: str) -> None:
         """
         Record that a scan has ended for concurrent tracking.
         
@@ -120,15 +282,17 @@ class RateLimiter:
         if self._use_demo:
             return self._demo_limiter.record_scan_end(client_ip)
         
-        concurrent_key = f"concurrent_scans:{client_ip}"
-        current_count = self.redis_client.get(concurrent_key)
-        
-        if current_count and int(current_count) > 0:
-            self.redis_client.decr(concurrent_key)
+        # Check and decrement atomically so the counter never goes negative
+        await self._release_scan(keys=[self._scan_keys(client_ip)[1]])
     
-    def is_rate_limited(self, client_ip: str, endpoint: str = "default") -> bool:
+    async def is_rate_limited(self, client_ip: str, endpoint: str = "default") -> bool:
         """
-        Check if client is rate limited for general API usage.
+        Record an API request and check if the client is rate limited.
+        
+        Uses a fixed-window counter: one integer per client, endpoint and
+        window, incremented atomically on the server. A local token bucket
+        sits in front of it so a client that is already limited is denied
+        without a Redis round-trip until its bucket refills.
         
         Args:
             client_ip: Client IP address
@@ -140,41 +304,54 @@ class RateLimiter:
         if self._use_demo:
             return self._demo_limiter.is_rate_limited(client_ip, endpoint)
         
-        current_time = int(time.time())
-        window_start = current_time - self.rate_limit_window
+        bucket = self._take_local_token(client_ip, endpoint)
+        if bucket is None:
+            return True
         
-        # Create unique key for this IP and endpoint
-        key = f"rate_limit:{client_ip}:{endpoint}"
+        key = self._request_window_key(client_ip, endpoint)
+        current_requests = await self._count_request(keys=[key], args=[self.rate_limit_window])
         
-        # Clean old entries and count current requests
-        pipeline = self.redis_client.pipeline()
-        pipeline.zremrangebyscore(key, 0, window_start)
-        pipeline.zcard(key)
-        pipeline.expire(key, self.rate_limit_window)
+        if current_requests > self._rl_requests:
+            # Deny locally until the bucket refills
+            bucket[0] = 0.0
+            return True
         
-        results = pipeline.execute()
-        current_requests = results[1]
-        
-        return current_requests >= settings.RATE_LIMIT_REQUESTS
+        return False
     
-    def record_request(self, client_ip: str, endpoint: str = "default") -> None:
+    def _take_local_token(self, client_ip: str, endpoint: str):
         """
-        Record an API request for rate limiting.
+        Take a token from the local bucket for this client and endpoint.
         
         Args:
             client_ip: Client IP address
             endpoint: API endpoint being accessed
+            
+        Returns:
+            list: The bucket if a token was taken, None if it is empty
         """
-        current_time = int(time.time())
-        key = f"rate_limit:{client_ip}:{endpoint}"
+        now = time.monotonic()
+        bucket_key = (client_ip, endpoint)
+        bucket = self._local_buckets.get(bucket_key)
+        
+        if bucket is None:
+            if len(self._local_buckets) >= LOCAL_BUCKET_CAPACITY:
+                # Evict the oldest bucket (dicts keep insertion order)
+                del self._local_buckets[next(iter(self._local_buckets))]
+            bucket = self._local_buckets[bucket_key] = [float(self._rl_requests), now]
+        else:
+            bucket[0] = min(
+                float(self._rl_requests),
+                bucket[0] + (now - bucket[1]) * self._refill_rate
+            )
+            bucket[1] = now
         
-        # Add current timestamp to sorted set
-        pipeline = self.redis_client.pipeline()
-        pipeline.zadd(key, {str(current_time): current_time})
-        pipeline.expire(key, self.rate_limit_window)
-        pipeline.execute()
+        if bucket[0] < 1.0:
+            return None
+        
+        bucket[0] -= 1.0
+        return bucket
     
-    def get_remaining_requests(self, client_ip: str, endpoint: str = "default") -> int:
+    async def get_remaining_requests(self, client_ip: str, endpoint: str = "default") -> int:
         """
         Get number of remaining requests in current window.
         
@@ -185,21 +362,11 @@ class RateLimiter:
         Returns:
             int: Number of remaining requests
         """
-        current_time = int(time.time())
-        window_start = current_time - self.rate_limit_window
-        key = f"rate_limit:{client_ip}:{endpoint}"
-        
-        # Clean old entries and count current requests
-        pipeline = self.redis_client.pipeline()
-        pipeline.zremrangebyscore(key, 0, window_start)
-        pipeline.zcard(key)
+        current_requests = await self.redis_client.get(self._request_window_key(client_ip, endpoint)) or 0
         
-        results = pipeline.execute()
-        current_requests = results[1]
-        
-        return max(0, settings.RATE_LIMIT_REQUESTS - current_requests)
+        return max(0, self._rl_requests - int(current_requests))
     
-    def reset_rate_limit(self, client_ip: str, endpoint: str = "default") -> None:
+    async def reset_rate_limit(self, client_ip: str, endpoint: str = "default") -> None:
         """
         Reset rate limit for a client (admin function).
         
@@ -207,10 +374,39 @@ class RateLimiter:
             client_ip: Client IP address
             endpoint: API endpoint
         """
-        key = f"rate_limit:{client_ip}:{endpoint}"
-        self.redis_client.delete(key)
+        self._local_buckets.pop((client_ip, endpoint), None)
+        await self.redis_client.delete(self._request_window_key(client_ip, endpoint))
+    
+    def _scan_keys(self, client_ip: str) -> Tuple[bytes, bytes]:
+        """
+        Get the hourly and concurrent scan counter keys for a client.
+        
+        Keys are prebuilt as bytes and reused until the hour changes.
+        
+        Args:
+            client_ip: Client IP address
+            
+        Returns:
+            tuple: (hourly key, concurrent key)
+        """
+        hour = int(time.time()) // 3600
+        cached = self._key_cache.get(client_ip)
+        if cached is not None and cached[0] == hour:
+            return cached[1], cached[2]
+        
+        if cached is None and len(self._key_cache) >= LOCAL_BUCKET_CAPACITY:
+            del self._key_cache[next(iter(self._key_cache))]
+        hourly_key = f"scan_limit:{client_ip}:{hour}".encode()
+        concurrent_key = _concurrent_scan_key(client_ip)
+        self._key_cache[client_ip] = (hour, hourly_key, concurrent_key)
+        return hourly_key, concurrent_key
+    
+    def _request_window_key(self, client_ip: str, endpoint: str) -> str:
+        """Build the request counter key for the current window."""
+        window = int(time.time()) // self.rate_limit_window
+        return f"rate_limit:{client_ip}:{endpoint}:{window}"
     
-    def get_scan_stats(self, client_ip: str) -> Dict[str, int]:
+    async def get_scan_stats(self, client_ip: str) -> Dict[str, int]:
         """
         Get current scan statistics for a client.
         
@@ -220,21 +416,13 @@ class RateLimiter:
         Returns:
             dict: Scan statistics
         """
-        current_time = int(time.time())
-        
-        # Get hourly scans
-        hourly_key = f"scan_limit:{client_ip}:{current_time // 3600}"
-        hourly_scans = self.redis_client.get(hourly_key) or 0
-        
-        # Get concurrent scans
-        concurrent_key = f"concurrent_scans:{client_ip}"
-        concurrent_scans = self.redis_client.get(concurrent_key) or 0
+        hourly_scans, concurrent_scans = await self._scan_counts(client_ip)
         
         return {
-            "hourly_scans": int(hourly_scans),
+            "hourly_scans": hourly_scans,
             "max_hourly_scans": self.max_scans_per_hour,
-            "concurrent_scans": int(concurrent_scans),
+            "concurrent_scans": concurrent_scans,
             "max_concurrent_scans": self.max_concurrent_scans,
-            "remaining_hourly": max(0, self.max_scans_per_hour - int(hourly_scans)),
-            "can_start_scan": self.can_start_scan(client_ip)
+            "remaining_hourly": max(0, self.max_scans_per_hour - hourly_scans),
+            "can_start_scan": self._within_scan_limits(hourly_scans, concurrent_scans)
         }
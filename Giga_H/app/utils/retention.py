@@ -1,19 +1,45 @@
 """Data retention and cleanup utilities for compliance."""
 
 import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from functools import partial
+from typing import Dict, List, Any, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func, case, text
 import logging
 
-from app.database import get_db_session
+from app.database import engine, get_db_session
 from app.models import ScanRecord
 from app.config import settings
 from app.utils.encryption import encryption_service
 
 logger = logging.getLogger(__name__)
 
+# Expired scans are deleted one window of creation dates at a time so a
+# large backlog never becomes a single long-running DELETE
+DELETE_WINDOW = timedelta(days=1)
+
+# Scans are anonymized and committed in batches of this size
+ANONYMIZE_BATCH_SIZE = 1000
+
+# URLs and IPv4 addresses replaced in anonymized problem descriptions,
+# matched in a single pass; lastgroup tells which one was found
+_ANONYMIZE_RE = re.compile(r'(?P<url>https?://\S+)|(?P<ip>\b\d{1,3}(?:\.\d{1,3}){3}\b)')
+_DIGITS = frozenset('0123456789')
+
+# Plain SQL for the retention sweep: a purely time-based DELETE has no use
+# for ORM statement compilation, session synchronization or events
+_DELETE_SCANS_SQL = text(
+    f"DELETE FROM {ScanRecord.__tablename__} "
+    "WHERE created_at >= :window_start AND created_at < :window_end"
+)
+
+# Columns get_scan_data can return, and the empty value for list columns
+SCAN_DATA_FIELDS = ("scan_results", "problems", "recommendations", "general_score", "summary")
+_LIST_FIELDS = frozenset(("problems", "recommendations"))
+
 
 class DataRetentionManager:
     """
@@ -33,97 +59,189 @@ class DataRetentionManager:
         logger.info("Starting scheduled data cleanup")
         
         try:
-            with get_db_session() as db:
-                cleanup_stats = {
-                    "scan_results_deleted": 0,
-                    "anonymized_records": 0,
-                    "errors": 0
-                }
-                
+            cleanup_stats = {
+                "scan_results_deleted": 0,
+                "anonymized_records": 0,
+                "errors": 0
+            }
+            
+            # Both jobs derive their cutoffs from the same instant, so
+            # anonymization skips exactly the scans old enough to be deleted;
+            # the two touch disjoint rows and can run in separate sessions
+            now = datetime.utcnow()
+            tasks = [
                 # Clean up scan results based on retention policy
-                scan_results_deleted = self._cleanup_scan_results(db)
-                cleanup_stats["scan_results_deleted"] = scan_results_deleted
-                
+                partial(self._cleanup_scan_results, now=now),
                 # Anonymize old customer data while keeping analytics
-                anonymized_count = self._anonymize_old_data(db)
-                cleanup_stats["anonymized_records"] = anonymized_count
-                
-                # Clean up logs (would be implemented for actual log files)
-                # self._cleanup_logs()
-                
-                self.last_cleanup = datetime.utcnow()
-                
-                logger.info(f"Data cleanup completed: {cleanup_stats}")
-                return cleanup_stats
+                partial(self._anonymize_old_data, now=now)
+            ]
+            
+            if engine.dialect.name == "sqlite":
+                # SQLite runs on a single shared connection (StaticPool)
+                results = [self._run_in_session(task) for task in tasks]
+            else:
+                with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+                    results = list(executor.map(self._run_in_session, tasks))
+            
+            cleanup_stats["scan_results_deleted"], cleanup_stats["anonymized_records"] = results
+            
+            # Clean up logs (would be implemented for actual log files)
+            # self._cleanup_logs()
+            
+            self.last_cleanup = datetime.utcnow()
+            
+            logger.info(f"Data cleanup completed: {cleanup_stats}")
+            return cleanup_stats
                 
         except Exception as e:
             logger.error(f"Data cleanup failed: {e}")
             raise RetentionError(f"Cleanup operation failed: {e}")
     
-    def _cleanup_scan_results(self, db: Session) -> int:
+    def _run_in_session(self, task) -> Any:
+        """Run a cleanup task in its own database session."""
+        with get_db_session() as db:
+            return task(db)
+    
+    def _deletion_cutoff(self, now: datetime) -> datetime:
+        """Scans created before this date are due for deletion."""
+        retention_days = self.retention_policies.get("scan_results", 90)
+        return now - timedelta(days=retention_days)
+    
+    def _cleanup_scan_results(self, db: Session, now: Optional[datetime] = None) -> int:
         """
         Clean up old scan results based on retention policy.
         
         Args:
             db: Database session
+            now: Reference time for the retention cutoff (default: current UTC time)
             
         Returns:
             int: Number of records deleted
         """
-        retention_days = self.retention_policies.get("scan_results", 90)
-        cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
-        
-        # Find old scan records
-        old_scans = db.query(ScanRecord).filter(
-            ScanRecord.created_at < cutoff_date
-        ).all()
+        cutoff_date = self._deletion_cutoff(now or datetime.utcnow())
         
         deleted_count = 0
+        window_start = self._oldest_scan_date(db, datetime.min, cutoff_date)
         
-        for scan in old_scans:
-            try:
-                # Log the deletion for audit trail
-                logger.info(f"Deleting scan record {scan.id} (created: {scan.created_at})")
-                
-                db.delete(scan)
-                deleted_count += 1
-                
-            except Exception as e:
-                logger.error(f"Failed to delete scan {scan.id}: {e}")
-                continue
+        while window_start is not None:
+            window_end = min(window_start + DELETE_WINDOW, cutoff_date)
+            
+            # Bulk DELETE without loading the rows into the session; the
+            # driver's rowcount reports how many went, no COUNT needed
+            deleted = db.execute(
+                _DELETE_SCANS_SQL,
+                {"window_start": window_start, "window_end": window_end}
+            ).rowcount
+            db.commit()
+            deleted_count += deleted
+            
+            if deleted:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Deleted {deleted} scan records created {window_start} to {window_end}")
+                # Expired scans are usually contiguous, so try the next window
+                # directly instead of querying for the next oldest record
+                window_start = window_end if window_end < cutoff_date else None
+            else:
+                # Jump straight to the next remaining record, skipping empty windows
+                window_start = self._oldest_scan_date(db, window_end, cutoff_date)
         
         if deleted_count > 0:
-            db.commit()
-            logger.info(f"Deleted {deleted_count} old scan records")
+            logger.info(f"Deleted {deleted_count} old scan records (cutoff={cutoff_date.isoformat()})")
         
         return deleted_count
     
-    def _anonymize_old_data(self, db: Session) -> int:
+    def _oldest_scan_date(self, db: Session, start: datetime, end: datetime):
+        """
+        Get the creation date of the oldest scan in [start, end).
+        
+        Args:
+            db: Database session
+            start: Inclusive lower bound
+            end: Exclusive upper bound
+            
+        Returns:
+            datetime: Oldest creation date, or None if there are no scans
+        """
+        return db.query(func.min(ScanRecord.created_at)).filter(
+            ScanRecord.created_at >= start,
+            ScanRecord.created_at < end
+        ).scalar()
+    
+    def _anonymize_old_data(self, db: Session, now: Optional[datetime] = None) -> int:
         """
         Anonymize old customer data while preserving analytics value.
         
         Args:
             db: Database session
+            now: Reference time for the cutoffs (default: current UTC time)
             
         Returns:
             int: Number of records anonymized
         """
+        now = now or datetime.utcnow()
+        
         # Anonymize data after 6 months but keep for analytics
         anonymize_after_days = 180
-        cutoff_date = datetime.utcnow() - timedelta(days=anonymize_after_days)
+        cutoff_date = now - timedelta(days=anonymize_after_days)
+        # Scans past the retention period are being deleted, not anonymized
+        deletion_cutoff = self._deletion_cutoff(now)
         
-        # Find scans that need anonymization (not already anonymized)
-        scans_to_anonymize = db.query(ScanRecord).filter(
+        # Find scans that need anonymization (not already anonymized),
+        # selecting only the columns the anonymizer reads
+        pending = db.query(
+            ScanRecord.id,
+            ScanRecord.target,
+            ScanRecord.email,
+            ScanRecord.client_ip,
+            ScanRecord.scan_results,
+            ScanRecord.problems,
+            ScanRecord.recommendations
+        ).filter(
             and_(
                 ScanRecord.created_at < cutoff_date,
+                ScanRecord.created_at >= deletion_cutoff,
                 ScanRecord.client_ip.isnot(None),  # Not already anonymized
                 ScanRecord.target.notlike('anonymous-%')  # Not already anonymized
             )
-        ).all()
+        ).order_by(ScanRecord.id)
         
         anonymized_count = 0
+        last_id = None
+        
+        # Walk the candidates in id order one batch at a time and write
+        # each batch back with a single executemany UPDATE
+        while True:
+            batch_query = pending if last_id is None else pending.filter(ScanRecord.id > last_id)
+            batch = batch_query.limit(ANONYMIZE_BATCH_SIZE).all()
+            if not batch:
+                break
+            last_id = batch[-1].id
+            
+            updates = self._anonymize_batch(batch)
+            if updates:
+                db.bulk_update_mappings(ScanRecord, updates)
+                db.commit()
+            anonymized_count += len(updates)
         
-        for scan in scans_to_anonymize:
+        if anonymized_count > 0:
+            logger.info(f"Anonymized {anonymized_count} scan records")
+        
+        return anonymized_count
+    
+    def _anonymize_batch(self, scans: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Build anonymized column values for a batch of scan rows.
+        
+        Args:
+            scans: Scan rows with the columns selected in _anonymize_old_data
+            
+        Returns:
+            list: Update mappings (including the primary key) for anonymized rows
+        """
+        updates = []
+        debug = logger.isEnabledFor(logging.DEBUG)
+        
+        for scan in scans:
             try:
                 # Create anonymized version of scan data
                 original_data = {
@@ -138,31 +256,33 @@ class DataRetentionManager:
                 anonymized_data = encryption_service.create_anonymized_data(original_data)
                 
                 # Update scan record with anonymized data
-                scan.target = anonymized_data.get("target", f"anonymized-{scan.id}")
-                scan.email = None  # Remove email completely
-                scan.client_ip = None  # Remove IP completely
-                scan.scan_results = anonymized_data.get("scan_results", {})
+                update = {
+                    "id": scan.id,
+                    "target": anonymized_data.get("target", f"anonymized-{scan.id}"),
+                    "email": None,  # Remove email completely
+                    "client_ip": None,  # Remove IP completely
+                    "scan_results": anonymized_data.get("scan_results", {}),
+                    "problems": scan.problems,
+                    "recommendations": scan.recommendations
+                }
                 
                 # Keep problems and recommendations but anonymize targets in descriptions
                 if scan.problems:
-                    scan.problems = self._anonymize_problems(scan.problems, anonymized_data["target"])
+                    update["problems"] = self._anonymize_problems(scan.problems, anonymized_data["target"])
                 
                 if scan.recommendations:
-                    scan.recommendations = self._anonymize_recommendations(scan.recommendations, anonymized_data["target"])
+                    update["recommendations"] = self._anonymize_recommendations(scan.recommendations, anonymized_data["target"])
                 
-                anonymized_count += 1
+                updates.append(update)
                 
-                logger.debug(f"Anonymized scan record {scan.id}")
+                if debug:
+                    logger.debug(f"Anonymized scan record {scan.id}")
                 
             except Exception as e:
                 logger.error(f"Failed to anonymize scan {scan.id}: {e}")
                 continue
         
-        if anonymized_count > 0:
-            db.commit()
-            logger.info(f"Anonymized {anonymized_count} scan records")
-        
-        return anonymized_count
+        return updates
     
     def _anonymize_problems(self, problems: List[Dict[str, Any]], anonymized_target: str) -> List[Dict[str, Any]]:
         """
@@ -176,6 +296,10 @@ class DataRetentionManager:
             list: Anonymized problems
         """
         anonymized_problems = []
+        anonymized_url = f'https://{anonymized_target}'
+        
+        def replace(match):
+            return anonymized_url if match.lastgroup == 'url' else anonymized_target
         
         for problem in problems:
             anonymized_problem = problem.copy()
@@ -184,9 +308,10 @@ class DataRetentionManager:
             if "description" in anonymized_problem:
                 desc = anonymized_problem["description"]
                 # Replace URLs and IPs with anonymized target
-                import re
-                desc = re.sub(r'https?://[^\s]+', f'https://{anonymized_target}', desc)
-                desc = re.sub(r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b', anonymized_target, desc)
+                # Cheap substring/character checks skip the regex for the
+                # common description that has neither
+                if 'http' in desc or not _DIGITS.isdisjoint(desc):
+                    desc = _ANONYMIZE_RE.sub(replace, desc)
                 anonymized_problem["description"] = desc
             
             anonymized_problems.append(anonymized_problem)
@@ -214,8 +339,9 @@ class DataRetentionManager:
                 anonymized_steps = []
                 for step in anonymized_rec["steps"]:
                     # Replace specific references with generic ones
-                    anonymized_step = step.replace(anonymized_target, "[target]")
-                    anonymized_steps.append(anonymized_step)
+                    if anonymized_target in step:
+                        step = step.replace(anonymized_target, "[target]")
+                    anonymized_steps.append(step)
                 anonymized_rec["steps"] = anonymized_steps
             
             anonymized_recommendations.append(anonymized_rec)
@@ -262,33 +388,42 @@ class DataRetentionManager:
             logger.error(f"Failed to save scan data for {scan_id}: {e}")
             raise RetentionError(f"Data save failed: {e}")
     
-    def get_scan_data(self, scan_id: str) -> Dict[str, Any]:
+    def get_scan_data(self, scan_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Retrieve and decrypt scan data.
         
+        Only the requested columns are selected, and scan results are only
+        decrypted when they are among them.
+        
         Args:
             scan_id: Scan identifier
+            fields: Subset of SCAN_DATA_FIELDS to return (default: all)
             
         Returns:
             dict: Decrypted scan data
         """
+        fields = tuple(fields) if fields is not None else SCAN_DATA_FIELDS
+        if not fields:
+            raise RetentionError("No scan data fields requested")
+        unknown = set(fields).difference(SCAN_DATA_FIELDS)
+        if unknown:
+            raise RetentionError(f"Unknown scan data fields: {', '.join(sorted(unknown))}")
+        
         try:
             with get_db_session() as db:
-                scan_record = db.query(ScanRecord).filter(ScanRecord.id == scan_id).first()
+                row = db.query(
+                    *[getattr(ScanRecord, field) for field in fields]
+                ).filter(ScanRecord.id == scan_id).first()
                 
-                if not scan_record:
+                if not row:
                     raise RetentionError(f"Scan record not found: {scan_id}")
                 
-                data = {
-                    "scan_results": scan_record.scan_results,
-                    "problems": scan_record.problems or [],
-                    "recommendations": scan_record.recommendations or [],
-                    "general_score": scan_record.general_score,
-                    "summary": scan_record.summary
-                }
+                data = {}
+                for field, value in zip(fields, row):
+                    data[field] = (value or []) if field in _LIST_FIELDS else value
                 
                 # Decrypt scan results if they're encrypted
-                if (isinstance(data["scan_results"], dict) and 
+                if (isinstance(data.get("scan_results"), dict) and 
                     "encrypted" in data["scan_results"]):
                     try:
                         encrypted_data = data["scan_results"]["encrypted"]
@@ -313,30 +448,31 @@ class DataRetentionManager:
         """
         try:
             with get_db_session() as db:
-                total_scans = db.query(ScanRecord).count()
-                
-                # Count scans by age
                 now = datetime.utcnow()
-                recent_scans = db.query(ScanRecord).filter(
-                    ScanRecord.created_at > now - timedelta(days=30)
-                ).count()
+                recent_cutoff = now - timedelta(days=30)
+                deletion_cutoff = self._deletion_cutoff(now)
                 
-                old_scans = db.query(ScanRecord).filter(
-                    ScanRecord.created_at < now - timedelta(days=self.retention_policies["scan_results"])
-                ).count()
+                def count_where(condition):
+                    return func.sum(case((condition, 1), else_=0))
                 
-                anonymized_scans = db.query(ScanRecord).filter(
-                    or_(
+                # All counts come from one scan of the table
+                counts = db.query(
+                    func.count(ScanRecord.id),
+                    count_where(ScanRecord.created_at > recent_cutoff),
+                    count_where(ScanRecord.created_at < deletion_cutoff),
+                    count_where(or_(
                         ScanRecord.target.like('anonymous-%'),
                         ScanRecord.client_ip.is_(None)
-                    )
-                ).count()
+                    ))
+                ).one()
+                total_scans, recent_scans, old_scans, anonymized_scans = counts
                 
+                # SUM() is NULL on an empty table
                 return {
                     "total_scans": total_scans,
-                    "recent_scans_30_days": recent_scans,
-                    "scans_eligible_for_deletion": old_scans,
-                    "anonymized_scans": anonymized_scans,
+                    "recent_scans_30_days": recent_scans or 0,
+                    "scans_eligible_for_deletion": old_scans or 0,
+                    "anonymized_scans": anonymized_scans or 0,
                     "last_cleanup": self.last_cleanup.isoformat() if self.last_cleanup else None,
                     "retention_policies": self.retention_policies
                 }
@@ -344,6 +480,27 @@ class DataRetentionManager:
         except Exception as e:
             logger.error(f"Failed to get retention status: {e}")
             return {"error": str(e)}
+    
+    # Async entry points for the API's event loop. Each call runs the sync
+    # implementation on a worker thread with its own session(s), so the
+    # database work never blocks the loop and no session is shared
+    # between coroutines.
+    
+    async def schedule_data_cleanup_async(self) -> Dict[str, int]:
+        """Run schedule_data_cleanup without blocking the event loop."""
+        return await asyncio.to_thread(self.schedule_data_cleanup)
+    
+    async def save_scan_data_async(self, scan_id: str, data: Dict[str, Any]) -> None:
+        """Run save_scan_data without blocking the event loop."""
+        await asyncio.to_thread(self.save_scan_data, scan_id, data)
+    
+    async def get_scan_data_async(self, scan_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Run get_scan_data without blocking the event loop."""
+        return await asyncio.to_thread(self.get_scan_data, scan_id, fields)
+    
+    async def get_retention_status_async(self) -> Dict[str, Any]:
+        """Run get_retention_status without blocking the event loop."""
+        return await asyncio.to_thread(self.get_retention_status)
 
 
 class RetentionError(Exception):
@@ -2,10 +2,32 @@
 
 import re
 import ipaddress
+from functools import lru_cache
 import validators
-from typing import Union
+from typing import Optional, Union
 from urllib.parse import urlparse
 
+# Characters stripped by sanitize_input, removed in a single translate() pass
+_DANGEROUS_CHARS_TABLE = str.maketrans('', '', '<>"\'&;()|`$')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# RFC 1035 host name: up to 253 chars of 1-63 char labels, alphabetic or
+# punycode TLD. No nested quantifiers, so bad input fails fast.
+_DOMAIN_RE = re.compile(
+    r'(?=.{1,253}\Z)(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+(?:[a-z]{2,63}|xn--[a-z0-9-]{1,59})\Z',
+    re.IGNORECASE
+)
+
+# Names always treated as the local machine, and the characters an IP
+# address literal can contain (anything else is not worth parsing)
+_LOCALHOST = frozenset({'localhost', '127.0.0.1', '::1', '0.0.0.0'})
+_IP_CHARS = frozenset('0123456789abcdef:.')
+
+IPAddress = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+
+# Validation results are cached since the same targets recur across scans
+VALIDATION_CACHE_SIZE = 4096
+
 
 def validate_target(target: str) -> bool:
     """
@@ -20,12 +42,15 @@ def validate_target(target: str) -> bool:
     if not target or not isinstance(target, str):
         return False
     
-    target = target.strip().lower()
-    
+    return _validate_normalized_target(target.strip().lower())
+
+
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _validate_normalized_target(target: str) -> bool:
+    """Validate a stripped, lower-cased target (see validate_target)."""
     # Remove common prefixes
     if target.startswith(('http://', 'https://')):
-        parsed = urlparse(target)
-        target = parsed.hostname or parsed.netloc
+        target = _url_host(target)
     
     # Validate IP address
     if is_valid_ip(target):
@@ -38,6 +63,44 @@ def validate_target(target: str) -> bool:
     return False
 
 
+def _url_host(url: str) -> str:
+    """
+    Extract the host from an http(s) URL without a full urlparse().
+    
+    Args:
+        url: URL starting with http:// or https://
+        
+    Returns:
+        str: Host name or IP (IPv6 without brackets)
+    """
+    netloc = url.split('://', 1)[1]
+    for separator in '/?#':
+        netloc = netloc.split(separator, 1)[0]
+    
+    host = netloc.rpartition('@')[2]
+    if host.startswith('['):
+        end = host.find(']')
+        return host[1:end] if end > 0 else host
+    return host.split(':', 1)[0]
+
+
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _parse_ip(ip_str: str) -> Optional[IPAddress]:
+    """
+    Parse an IP address once for all the IP checks below.
+    
+    Args:
+        ip_str: IP address string
+        
+    Returns:
+        IPv4Address/IPv6Address, or None if the string is not an IP
+    """
+    try:
+        return ipaddress.ip_address(ip_str)
+    except ValueError:
+        return None
+
+
 def is_valid_ip(ip_str: str) -> bool:
     """
     Check if string is a valid IP address (IPv4 or IPv6).
@@ -48,13 +111,10 @@ def is_valid_ip(ip_str: str) -> bool:
     Returns:
         bool: True if valid IP, False otherwise
     """
-    try:
-        ipaddress.ip_address(ip_str)
-        return True
-    except ValueError:
-        return False
+    return _parse_ip(ip_str) is not None
 
 
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
 def is_valid_domain(domain: str) -> bool:
     """
     Check if string is a valid domain name.
@@ -65,11 +125,17 @@ def is_valid_domain(domain: str) -> bool:
     Returns:
         bool: True if valid domain, False otherwise
     """
-    try:
-        # Use validators library for domain validation
-        return validators.domain(domain) is True
-    except:
+    if not isinstance(domain, str):
         return False
+    
+    # Internationalized names are checked in their ASCII (punycode) form
+    if not domain.isascii():
+        try:
+            domain = domain.encode('idna').decode('ascii')
+        except UnicodeError:
+            return False
+    
+    return _DOMAIN_RE.match(domain) is not None
 
 
 def is_private_ip(ip_str: str) -> bool:
@@ -82,11 +148,8 @@ def is_private_ip(ip_str: str) -> bool:
     Returns:
         bool: True if private IP, False otherwise
     """
-    try:
-        ip = ipaddress.ip_address(ip_str)
-        return ip.is_private
-    except ValueError:
-        return False
+    ip = _parse_ip(ip_str)
+    return ip is not None and ip.is_private
 
 
 def is_public_ip(ip_str: str) -> bool:
@@ -99,11 +162,10 @@ def is_public_ip(ip_str: str) -> bool:
     Returns:
         bool: True if public IP, False otherwise
     """
-    try:
-        ip = ipaddress.ip_address(ip_str)
-        return not (ip.is_private or ip.is_loopback or ip.is_reserved or ip.is_multicast)
-    except ValueError:
+    ip = _parse_ip(ip_str)
+    if ip is None:
         return False
+    return not (ip.is_private or ip.is_loopback or ip.is_reserved or ip.is_multicast)
 
 
 def sanitize_input(input_str: str, max_length: int = 255) -> str:
@@ -120,20 +182,16 @@ def sanitize_input(input_str: str, max_length: int = 255) -> str:
     if not input_str:
         return ""
     
-    # Limit length
-    sanitized = input_str[:max_length]
-    
-    # Remove potentially dangerous characters
-    dangerous_chars = ['<', '>', '"', "'", '&', ';', '(', ')', '|', '`', '$']
-    for char in dangerous_chars:
-        sanitized = sanitized.replace(char, '')
+    # Limit length and remove potentially dangerous characters
+    sanitized = input_str[:max_length].translate(_DANGEROUS_CHARS_TABLE)
     
     # Remove multiple spaces and newlines
-    sanitized = re.sub(r'\s+', ' ', sanitized).strip()
+    sanitized = _WHITESPACE_RE.sub(' ', sanitized).strip()
     
     return sanitized
 
 
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
 def validate_email(email: str) -> bool:
     """
     Validate email address format.
@@ -184,6 +242,7 @@ def get_domain_from_url(url: str) -> str:
         return ''
 
 
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
 def is_localhost(target: str) -> bool:
     """
     Check if target is localhost or loopback address.
@@ -194,24 +253,16 @@ def is_localhost(target: str) -> bool:
     Returns:
         bool: True if localhost, False otherwise
     """
-    localhost_patterns = [
-        'localhost',
-        '127.0.0.1',
-        '::1',
-        '0.0.0.0'
-    ]
-    
     target = target.lower().strip()
     
     # Check exact matches
-    if target in localhost_patterns:
+    if target in _LOCALHOST:
         return True
     
-    # Check if it's an IP in loopback range
-    try:
-        ip = ipaddress.ip_address(target)
-        return ip.is_loopback
-    except ValueError:
-        pass
+    # Host names cannot be IPs; skip the parse and its ValueError
+    if not _IP_CHARS.issuperset(target):
+        return False
     
-    return False
+    # Check if it's an IP in loopback range
+    ip = _parse_ip(target)
+    return ip is not None and ip.is_loopback
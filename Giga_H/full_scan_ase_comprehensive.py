@@ -15,6 +15,8 @@ This script performs a complete cybersecurity scan of ase.md using all 8 scanner
 """
 
 import asyncio
+import heapq
+import sys
 import time
 from datetime import datetime
 from app.scanners.internet_exposure import InternetExposureScanner
@@ -25,9 +27,34 @@ from app.scanners.cve_vulnerabilities import CVEVulnerabilityScanner
 from app.scanners.iam_assessment import IAMAssessmentScanner
 from app.scanners.backup_dr import BackupDRScanner
 from app.scanners.security_monitoring import SecurityMonitoringScanner
-from app.scanners.scoring import ScoringEngine
+from app.scanners.scoring import scoring_engine
+from app.scanners.base import create_scan_session
 from app.utils.multi_logger import multi_logger
 
+try:
+    import uvloop
+except ImportError:  # e.g. Windows; fall back to the default event loop
+    uvloop = None
+
+# Underline for report section headings
+_BAR = "-" * 40
+
+# Scoring category of each scanner's results
+SCANNER_CATEGORIES = {
+    "Internet Exposure": "internet_exposure",
+    "TLS/SSL Security": "tls_security",
+    "Web Security Headers": "web_security",
+    "Email Authentication": "email_security",
+    "CVE Vulnerabilities": "vulnerabilities",
+    "IAM Assessment": "iam_assessment",
+    "Backup & DR": "backup_dr",
+    "Security Monitoring": "logging_monitoring"
+}
+
+# Problem severities listed under the top critical issues, most severe first
+SEVERITY_RANK = {'critical': 0, 'high': 1}
+SEVERE = frozenset(SEVERITY_RANK)
+
 def print_banner():
     """Print scan banner."""
     print("🎯 " + "=" * 70)
@@ -50,6 +77,46 @@ def format_duration(seconds):
         hours = seconds / 3600
         return f"{hours:.1f} hours"
 
+def _render_exposure_details(results, out):
+    """Report open ports found by the Internet Exposure scanner."""
+    if 'open_ports' in results:
+        ports = results['open_ports']
+        out(f"   🔓 Open Ports: {len(ports)} found")
+        for port_info in ports[:3]:
+            out(f"      • Port {port_info.get('port')}: {port_info.get('service', 'Unknown')}")
+
+def _render_tls_details(results, out):
+    """Report the certificate found by the TLS/SSL scanner."""
+    if 'certificate' in results:
+        cert = results['certificate']
+        out(f"   🔒 Certificate: {cert.get('subject', 'Unknown')}")
+        out(f"   📅 Expires: {cert.get('valid_until', 'Unknown')}")
+
+def _render_headers_details(results, out):
+    """Report present and missing security headers."""
+    if 'headers' in results:
+        headers = results['headers']
+        missing = [h for h, present in headers.items() if not present]
+        out(f"   🛡️  Security Headers: {len(headers) - len(missing)}/{len(headers)} present")
+        if missing:
+            out(f"   ❌ Missing: {', '.join(missing[:3])}")
+
+def _render_email_details(results, out):
+    """Report SPF, DKIM and DMARC status."""
+    if 'spf' in results:
+        spf = "✅" if results['spf'].get('valid') else "❌"
+        dkim = "✅" if results.get('dkim', {}).get('valid') else "❌"
+        dmarc = "✅" if results.get('dmarc', {}).get('valid') else "❌"
+        out(f"   📧 SPF: {spf} | DKIM: {dkim} | DMARC: {dmarc}")
+
+# Scanner-specific sections of the detailed results
+DETAIL_RENDERERS = {
+    "Internet Exposure": _render_exposure_details,
+    "TLS/SSL Security": _render_tls_details,
+    "Web Security Headers": _render_headers_details,
+    "Email Authentication": _render_email_details
+}
+
 async def run_comprehensive_scan():
     """Run comprehensive scan with all scanners."""
     target = "ase.md"
@@ -65,7 +132,7 @@ async def run_comprehensive_scan():
         scan_type="full"
     )
     
-    total_start_time = time.time()
+    total_start_time = time.perf_counter()
     all_results = {}
     all_problems = []
     all_recommendations = []
@@ -84,74 +151,92 @@ async def run_comprehensive_scan():
     ]
     
     print(f"🚀 Starting comprehensive scan of {target}")
-    print(f"📊 Running {len(scanners)} security scanners...")
+    print(f"📊 Running {len(scanners)} security scanners concurrently...")
     print()
     
-    # Run each scanner
-    for i, (scanner_name, scanner) in enumerate(scanners, 1):
-        print(f"[{i}/{len(scanners)}] 🔍 Running {scanner_name}...")
-        
-        scanner_start = time.time()
+    async def _run_one(scanner_name, scanner, session):
+        """Run one scanner on the shared session, timing and logging it."""
+        scanner_start = time.perf_counter()
         
         try:
-            # Run the scan
-            results = scanner.scan()
-            scanner_duration = time.time() - scanner_start
-            scanner_timings[scanner_name] = scanner_duration
-            
-            # Log scanner completion
-            multi_logger.log_scan_timing(
-                scan_id=scan_id,
-                scanner=scanner_name.replace(" ", ""),
-                duration=scanner_duration
-            )
-            
-            # Store results
-            all_results[scanner_name] = results
-            
-            # Extract problems and recommendations
-            if 'problems' in results:
-                all_problems.extend(results['problems'])
-            if 'recommendations' in results:
-                all_recommendations.extend(results['recommendations'])
-            
-            print(f"   ✅ {scanner_name} completed in {format_duration(scanner_duration)}")
-            
-            if 'problems' in results and results['problems']:
-                print(f"      🚨 Found {len(results['problems'])} issues")
-                for problem in results['problems'][:2]:  # Show first 2 problems
-                    print(f"         • {problem.get('title', 'Security Issue')}")
-                if len(results['problems']) > 2:
-                    print(f"         • ... and {len(results['problems']) - 2} more")
-            else:
-                print(f"      ✅ No critical issues found")
-                
+            # aiohttp scanners run on this loop; blocking ones on a thread
+            results = await scanner.scan_async(session)
         except Exception as e:
-            scanner_duration = time.time() - scanner_start
-            print(f"   ❌ {scanner_name} failed: {str(e)}")
-            
-            # Log scanner error
+            # Log scanner error (multi_logger queues per thread, so this is
+            # safe while other scanners are still running)
             multi_logger.log_scan_error(
                 scan_id=scan_id,
                 scanner=scanner_name.replace(" ", ""),
                 target=target,
                 error=str(e)
             )
+            raise
+        
+        scanner_duration = time.perf_counter() - scanner_start
+        scanner_timings[scanner_name] = scanner_duration
+        
+        return results
+    
+    # The scanners are network-bound, so running them side by side makes
+    # the wall time that of the slowest one instead of the sum
+    async with create_scan_session() as session:
+        outcomes = await asyncio.gather(
+            *(_run_one(scanner_name, scanner, session) for scanner_name, scanner in scanners),
+            return_exceptions=True
+        )
+    
+    # Log scanner completions in one batch
+    multi_logger.log_scan_timings(
+        scan_id,
+        [(scanner_name.replace(" ", ""), duration) for scanner_name, duration in scanner_timings.items()]
+    )
+    
+    # Collect the report and write it out once instead of line by line
+    lines = []
+    out = lines.append
+    
+    # Report in scanner order once everything has finished
+    for i, ((scanner_name, _), results) in enumerate(zip(scanners, outcomes), 1):
+        out(f"[{i}/{len(scanners)}] 🔍 {scanner_name}")
+        
+        if isinstance(results, Exception):
+            out(f"   ❌ {scanner_name} failed: {str(results)}")
             
             all_results[scanner_name] = {
-                "error": str(e),
+                "error": str(results),
                 "problems": [],
                 "recommendations": []
             }
+            out("")
+            continue
+        
+        # Store results
+        all_results[scanner_name] = results
+        
+        # Extract problems and recommendations
+        all_problems += results.get('problems', ())
+        all_recommendations += results.get('recommendations', ())
         
-        print()
+        out(f"   ✅ {scanner_name} completed in {format_duration(scanner_timings[scanner_name])}")
+        
+        if 'problems' in results and results['problems']:
+            out(f"      🚨 Found {len(results['problems'])} issues")
+            for problem in results['problems'][:2]:  # Show first 2 problems
+                out(f"         • {problem.get('title', 'Security Issue')}")
+            if len(results['problems']) > 2:
+                out(f"         • ... and {len(results['problems']) - 2} more")
+        else:
+            out(f"      ✅ No critical issues found")
+        
+        out("")
     
     # Calculate overall score
-    print("📊 Calculating Security Score...")
-    scorer = ScoringEngine()
-    overall_score = scorer.calculate_overall_score(all_results)
+    out("📊 Calculating Security Score...")
+    overall_score, category_scores = scoring_engine.calculate_overall_score(
+        {SCANNER_CATEGORIES[name]: results for name, results in all_results.items()}
+    )
     
-    total_duration = time.time() - total_start_time
+    total_duration = time.perf_counter() - total_start_time
     
     # Log scan completion
     multi_logger.log_scan_completed(
@@ -162,116 +247,93 @@ async def run_comprehensive_scan():
     )
     
     # Print comprehensive results
-    print("🎯 " + "=" * 70)
-    print("🎯   COMPREHENSIVE SCAN RESULTS")
-    print("🎯 " + "=" * 70)
-    print()
+    out("🎯 " + "=" * 70)
+    out("🎯   COMPREHENSIVE SCAN RESULTS")
+    out("🎯 " + "=" * 70)
+    out("")
     
-    print(f"🎯 Target: {target}")
-    print(f"⏱️  Total Duration: {format_duration(total_duration)}")
-    print(f"🔢 Overall Security Score: {overall_score}/100")
-    print(f"🚨 Total Issues Found: {len(all_problems)}")
-    print(f"💡 Total Recommendations: {len(all_recommendations)}")
-    print()
+    out(f"🎯 Target: {target}")
+    out(f"⏱️  Total Duration: {format_duration(total_duration)}")
+    out(f"🔢 Overall Security Score: {overall_score}/100")
+    out(f"🚨 Total Issues Found: {len(all_problems)}")
+    out(f"💡 Total Recommendations: {len(all_recommendations)}")
+    out("")
     
     # Scanner performance breakdown
-    print("📈 SCANNER PERFORMANCE:")
-    print("-" * 40)
+    out("📈 SCANNER PERFORMANCE:")
+    out(_BAR)
     for scanner_name, duration in scanner_timings.items():
-        print(f"   {scanner_name:<25} {format_duration(duration):>15}")
-    print()
+        out(f"   {scanner_name:<25} {format_duration(duration):>15}")
+    out("")
     
     # Security score breakdown
-    print("🏆 SECURITY SCORE BREAKDOWN:")
-    print("-" * 40)
+    out("🏆 SECURITY SCORE BREAKDOWN:")
+    out(_BAR)
     for scanner_name, results in all_results.items():
         if 'error' not in results:
-            # Calculate individual scanner score (simplified)
-            problems_count = len(results.get('problems', []))
-            scanner_score = max(0, 100 - (problems_count * 10))  # Simple scoring
-            print(f"   {scanner_name:<25} {scanner_score:>10}/100")
-    print()
+            scanner_score = category_scores[SCANNER_CATEGORIES[scanner_name]]
+            out(f"   {scanner_name:<25} {scanner_score:>10}/100")
+    out("")
     
     # Top critical issues
     if all_problems:
-        print("🚨 TOP CRITICAL ISSUES:")
-        print("-" * 40)
-        critical_issues = [p for p in all_problems if p.get('severity') in ['high', 'critical']]
-        for i, problem in enumerate(critical_issues[:5], 1):
+        out("🚨 TOP CRITICAL ISSUES:")
+        out(_BAR)
+        critical_issues = [p for p in all_problems if p.get('severity') in SEVERE]
+        # Critical before high, otherwise in the order found
+        top_issues = heapq.nsmallest(5, critical_issues, key=lambda p: SEVERITY_RANK[p['severity']])
+        for i, problem in enumerate(top_issues, 1):
             severity = problem.get('severity', 'medium').upper()
             title = problem.get('title', 'Security Issue')
-            print(f"   {i}. [{severity}] {title}")
+            out(f"   {i}. [{severity}] {title}")
         
         if len(critical_issues) > 5:
-            print(f"   ... and {len(critical_issues) - 5} more critical issues")
-        print()
+            out(f"   ... and {len(critical_issues) - 5} more critical issues")
+        out("")
     
     # Top recommendations
     if all_recommendations:
-        print("💡 TOP SECURITY RECOMMENDATIONS:")
-        print("-" * 40)
+        out("💡 TOP SECURITY RECOMMENDATIONS:")
+        out(_BAR)
         high_priority = [r for r in all_recommendations if r.get('priority') == 'high']
         for i, rec in enumerate(high_priority[:5], 1):
             title = rec.get('title', 'Security Recommendation')
-            print(f"   {i}. {title}")
+            out(f"   {i}. {title}")
             
         if len(high_priority) > 5:
-            print(f"   ... and {len(high_priority) - 5} more recommendations")
-        print()
+            out(f"   ... and {len(high_priority) - 5} more recommendations")
+        out("")
     
     # Detailed results by scanner
-    print("📋 DETAILED RESULTS BY SCANNER:")
-    print("=" * 70)
+    out("📋 DETAILED RESULTS BY SCANNER:")
+    out("=" * 70)
     
     for scanner_name, results in all_results.items():
-        print(f"\n🔍 {scanner_name.upper()}")
-        print("-" * 50)
+        out(f"\n🔍 {scanner_name.upper()}")
+        out("-" * 50)
         
         if 'error' in results:
-            print(f"   ❌ Scanner Error: {results['error']}")
+            out(f"   ❌ Scanner Error: {results['error']}")
             continue
             
         # Scanner-specific details
-        if scanner_name == "Internet Exposure":
-            if 'open_ports' in results:
-                ports = results['open_ports']
-                print(f"   🔓 Open Ports: {len(ports)} found")
-                for port_info in ports[:3]:
-                    print(f"      • Port {port_info.get('port')}: {port_info.get('service', 'Unknown')}")
-                    
-        elif scanner_name == "TLS/SSL Security":
-            if 'certificate' in results:
-                cert = results['certificate']
-                print(f"   🔒 Certificate: {cert.get('subject', 'Unknown')}")
-                print(f"   📅 Expires: {cert.get('valid_until', 'Unknown')}")
-                
-        elif scanner_name == "Web Security Headers":
-            if 'headers' in results:
-                headers = results['headers']
-                missing = [h for h, present in headers.items() if not present]
-                print(f"   🛡️  Security Headers: {len(headers) - len(missing)}/{len(headers)} present")
-                if missing:
-                    print(f"   ❌ Missing: {', '.join(missing[:3])}")
-                    
-        elif scanner_name == "Email Authentication":
-            if 'spf' in results:
-                spf = "✅" if results['spf'].get('valid') else "❌"
-                dkim = "✅" if results.get('dkim', {}).get('valid') else "❌"
-                dmarc = "✅" if results.get('dmarc', {}).get('valid') else "❌"
-                print(f"   📧 SPF: {spf} | DKIM: {dkim} | DMARC: {dmarc}")
+        render_details = DETAIL_RENDERERS.get(scanner_name)
+        if render_details is not None:
+            render_details(results, out)
         
         # Show problems for this scanner
         scanner_problems = results.get('problems', [])
         if scanner_problems:
-            print(f"   🚨 Issues: {len(scanner_problems)}")
+            out(f"   🚨 Issues: {len(scanner_problems)}")
             for problem in scanner_problems[:2]:
-                print(f"      • {problem.get('title', 'Issue')}")
+                out(f"      • {problem.get('title', 'Issue')}")
         else:
-            print(f"   ✅ No issues found")
+            out(f"   ✅ No issues found")
     
-    print("\n🎯 " + "=" * 70)
-    print("🎯   SCAN COMPLETED SUCCESSFULLY!")
-    print("🎯 " + "=" * 70)
+    out("\n🎯 " + "=" * 70)
+    out("🎯   SCAN COMPLETED SUCCESSFULLY!")
+    out("🎯 " + "=" * 70)
+    sys.stdout.write("\n".join(lines) + "\n")
     
     return {
         'target': target,
@@ -290,6 +352,10 @@ def main():
     print("📋 Preparing to scan ase.md with all 8 security modules")
     print()
     
+    # uvloop cuts per-socket overhead across the scanners' many probes
+    if uvloop is not None:
+        uvloop.install()
+    
     try:
         # Run the comprehensive scan
         results = asyncio.run(run_comprehensive_scan())
@@ -306,6 +372,8 @@ def main():
             error_type="comprehensive_scan_error",
             message=f"Full scan of ase.md failed: {str(e)}"
         )
+    finally:
+        multi_logger.flush()
 
 if __name__ == "__main__":
     main()
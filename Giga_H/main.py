@@ -2,11 +2,15 @@
 
 from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import JSONResponse, HTMLResponse, FileResponse, Response, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+from sqlalchemy import select, bindparam
 from sqlalchemy.orm import Session
+import asyncio
 import logging
 import os
+import time
+import orjson
 from datetime import datetime
 from uuid import uuid4
 
@@ -16,9 +20,10 @@ from app.models import ScanRequest, ScanResponse, ScanResults, ScanRecord, ScanS
 from app.scanners.tasks import perform_scan
 from app.scanners.demo_scanner import DemoScanner
 from app.utils.rate_limiter import RateLimiter
+from app.utils.cache import TTLCache
 from app.utils.validator import validate_target
 from app.utils.multi_logger import multi_logger
-from app.utils.logger import setup_logging
+from app.utils.logger import setup_logging, utc_now_iso
 
 # Setup logging (keep basic setup for FastAPI)
 setup_logging()
@@ -30,7 +35,8 @@ app = FastAPI(
     description=settings.DESCRIPTION,
     version=settings.VERSION,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -44,10 +50,43 @@ app.add_middleware(
 
 # Mount static files for the web interface
 app.mount("/static", StaticFiles(directory="static"), name="static")
+INDEX_HTML = os.path.join("static", "index.html")
 
 # Initialize rate limiter
 rate_limiter = RateLimiter()
 
+# Response caches: status briefly, so polling clients share one query per
+# TTL; serialized results only once a scan has completed and can no longer change.
+# Results still expire so retention deletion/anonymization shows through.
+status_cache = TTLCache(settings.SCAN_CACHE_SIZE, settings.SCAN_STATUS_CACHE_TTL)
+results_cache = TTLCache(settings.SCAN_CACHE_SIZE, settings.SCAN_RESULTS_CACHE_TTL)
+
+# Lookups used by the scan handlers, built once with the scan id as a bound
+# parameter so each request only supplies the value (and hits the
+# compiled statement cache)
+SCAN_STATUS_QUERY = select(
+    ScanRecord.status,
+    ScanRecord.target,
+    ScanRecord.created_at,
+    ScanRecord.started_at,
+    ScanRecord.completed_at,
+    ScanRecord.error_message
+).where(ScanRecord.id == bindparam("scan_id"))
+
+SCAN_HEADER_QUERY = select(
+    ScanRecord.target,
+    ScanRecord.status,
+    ScanRecord.created_at
+).where(ScanRecord.id == bindparam("scan_id"))
+
+SCAN_RESULTS_QUERY = select(
+    ScanRecord.general_score,
+    ScanRecord.problems,
+    ScanRecord.recommendations,
+    ScanRecord.summary,
+    ScanRecord.scan_results
+).where(ScanRecord.id == bindparam("scan_id"))
+
 # Create database tables on startup
 @app.on_event("startup")
 async def startup_event():
@@ -61,17 +100,19 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on application shutdown."""
     logger.info("Shutting down Cyber Hygiene Scanner API")
+    # Log records are written by a background thread; don't leave any queued
+    multi_logger.flush()
 
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log all HTTP requests for monitoring."""
-    start_time = datetime.utcnow()
+    start_time = time.perf_counter_ns()
     client_ip = request.client.host
     
     response = await call_next(request)
     
-    process_time = (datetime.utcnow() - start_time).total_seconds()
+    process_time = (time.perf_counter_ns() - start_time) / 1e9
     
     # Log API request using multi-logger
     multi_logger.log_api_request(
@@ -94,11 +135,15 @@ async def log_requests(request: Request, call_next):
 
 
 @app.get("/", response_class=HTMLResponse)
-async def root():
+async def root(request: Request):
     """Serve the main web interface."""
     try:
-        with open("static/index.html", "r", encoding="utf-8") as f:
-            return HTMLResponse(content=f.read())
+        # FileResponse streams the file (sendfile where available) and sets
+        # ETag/Last-Modified from this stat, so repeat visits can get a 304
+        response = FileResponse(INDEX_HTML, media_type="text/html", stat_result=os.stat(INDEX_HTML))
+        if request.headers.get("if-none-match") == response.headers["etag"]:
+            return Response(status_code=304, headers={"etag": response.headers["etag"]})
+        return response
     except FileNotFoundError:
         return HTMLResponse(content="""
         <html>
@@ -127,7 +172,7 @@ async def health_check():
     """Health check endpoint for monitoring."""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": utc_now_iso(),  # Per-second cached formatting
         "version": settings.VERSION
     }
 
@@ -156,8 +201,16 @@ async def create_scan(
             scan_type=scan_request.scan_type.value
         )
         
-        # Rate limiting check
-        if not rate_limiter.can_start_scan(client_ip):
+        # Validate target before taking a rate limit slot, so rejected
+        # requests don't count against the client's quota
+        if not validate_target(scan_request.target):
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid target. Please provide a valid IP address or domain name."
+            )
+        
+        # Rate limiting check (also records the scan start)
+        if not await rate_limiter.try_start_scan(client_ip):
             multi_logger.log_rate_limit_hit(
                 client_ip=client_ip,
                 endpoint="/api/v1/scan",
@@ -168,13 +221,6 @@ async def create_scan(
                 detail="Rate limit exceeded. Please try again later."
             )
         
-        # Validate target
-        if not validate_target(scan_request.target):
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid target. Please provide a valid IP address or domain name."
-            )
-        
         # Create scan record
         scan_id = str(uuid4())
         scan_record = ScanRecord(
@@ -186,17 +232,22 @@ async def create_scan(
             status=ScanStatus.QUEUED
         )
         
-        db.add(scan_record)
-        db.commit()
+        try:
+            db.add(scan_record)
+            db.commit()
+        except Exception:
+            # The scan never starts, so give the concurrent slot back
+            await rate_limiter.record_scan_end(client_ip)
+            raise
         
         # Check if we're in demo mode (no Redis/Celery)
-        demo_mode = os.getenv("DEMO_MODE", "false").lower() == "true"
-        
-        if demo_mode:
+        if settings.DEMO_MODE:
             # Run demo scan immediately
             try:
                 demo_scanner = DemoScanner(scan_request.target, scan_request.scan_type.value)
-                scan_results = demo_scanner.scan()
+                # Scanning blocks; keep it off the event loop so other
+                # requests are served while it runs
+                scan_results = await asyncio.to_thread(demo_scanner.scan)
                 
                 # Update scan record with results
                 scan_record.status = ScanStatus.COMPLETED
@@ -230,8 +281,13 @@ async def create_scan(
                 scan_record.error_message = str(e)
                 db.commit()
         else:
-            # Queue the scan task (production mode)
-            task = perform_scan.delay(scan_id, scan_request.target, scan_request.scan_type.value)
+            # Queue the scan task (production mode); the task releases the
+            # concurrent slot when it finishes
+            try:
+                task = perform_scan.delay(scan_id, scan_request.target, scan_request.scan_type.value)
+            except Exception:
+                await rate_limiter.record_scan_end(client_ip)
+                raise
         
         # Estimate duration based on scan type
         duration_estimates = {
@@ -243,12 +299,14 @@ async def create_scan(
         
         logger.info(f"Scan queued: {scan_id} for target {scan_request.target}")
         
-        return ScanResponse(
-            scan_id=scan_id,
-            status=ScanStatus.QUEUED,
-            estimated_duration=duration_estimates.get(scan_request.scan_type.value, "5-10 minutes"),
-            results_url=f"{settings.API_V1_PREFIX}/scan/{scan_id}/results"
-        )
+        # Same shape as ScanResponse (still the documented response_model),
+        # but returned as a Response so FastAPI doesn't re-validate it
+        return ORJSONResponse({
+            "scan_id": scan_id,
+            "status": ScanStatus.QUEUED,
+            "estimated_duration": duration_estimates.get(scan_request.scan_type.value, "5-10 minutes"),
+            "results_url": f"{settings.API_V1_PREFIX}/scan/{scan_id}/results"
+        })
         
     except HTTPException:
         raise
@@ -268,8 +326,15 @@ async def get_scan_results(scan_id: str, db: Session = Depends(get_db)):
     - **scan_id**: UUID of the scan to retrieve
     """
     try:
-        # Get scan record from database
-        scan_record = db.query(ScanRecord).filter(ScanRecord.id == scan_id).first()
+        cached = results_cache.get(scan_id)
+        if cached is not None:
+            if settings.DEMO_MODE:
+                _log_results_access(scan_id)
+            logger.info(f"Retrieved scan results for: {scan_id}")
+            return Response(content=cached, media_type="application/json")
+        
+        # Get scan record from database, without the result columns yet
+        scan_record = db.execute(SCAN_HEADER_QUERY, {"scan_id": scan_id}).first()
         
         if not scan_record:
             raise HTTPException(
@@ -277,34 +342,39 @@ async def get_scan_results(scan_id: str, db: Session = Depends(get_db)):
                 detail="Scan not found"
             )
         
+        # Results are only written when a scan completes, so only then is
+        # it worth reading the (potentially large) JSON columns
+        result_columns = None
+        if scan_record.status == ScanStatus.COMPLETED:
+            result_columns = db.execute(SCAN_RESULTS_QUERY, {"scan_id": scan_id}).first()
+        general_score, problems_data, recommendations_data, summary, scan_results = result_columns or (None,) * 5
+        
         # Convert problems and recommendations to proper format for JSON response
-        problems_data = scan_record.problems or []
-        recommendations_data = scan_record.recommendations or []
+        problems_data = problems_data or []
+        recommendations_data = recommendations_data or []
         
         # For demo mode, return as simple JSON response instead of using Pydantic model
-        if os.getenv("DEMO_MODE", "false").lower() == "true":
+        if settings.DEMO_MODE:
             response_data = {
                 "scan_id": scan_id,
                 "target": scan_record.target,
                 "status": scan_record.status,
                 "timestamp": scan_record.created_at.isoformat() if scan_record.created_at else None,
-                "general_score": scan_record.general_score,
+                "general_score": general_score,
                 "problems": problems_data,
                 "recommendations": recommendations_data,
-                "summary": scan_record.summary,
-                "results": scan_record.scan_results or {}
+                "summary": summary,
+                "results": scan_results or {}
             }
             
-            # Log audit event
-            multi_logger.log_data_access(
-                user_id="anonymous",  # In demo mode, no user auth
-                action="scan_results_retrieved",
-                resource=f"scan_{scan_id}",
-                client_ip="127.0.0.1"  # Demo mode
-            )
+            body = orjson.dumps(response_data)
+            if scan_record.status == ScanStatus.COMPLETED:
+                results_cache.set(scan_id, body)
+            
+            _log_results_access(scan_id)
             
             logger.info(f"Retrieved scan results for: {scan_id}")
-            return response_data
+            return Response(content=body, media_type="application/json")
         
         # For production mode, use proper Pydantic models
         response = ScanResults(
@@ -312,16 +382,22 @@ async def get_scan_results(scan_id: str, db: Session = Depends(get_db)):
             target=scan_record.target,
             status=ScanStatus(scan_record.status),
             timestamp=scan_record.created_at,
-            general_score=scan_record.general_score,
+            general_score=general_score,
             problems=problems_data,  # This might need conversion
             recommendations=recommendations_data,  # This might need conversion
-            summary=scan_record.summary,
-            results=scan_record.scan_results or {}
+            summary=summary,
+            results=scan_results or {}
         )
         
+        # Serialize straight from the validated model; returning the model
+        # would send it through jsonable_encoder first
+        body = response.model_dump_json().encode()
+        if scan_record.status == ScanStatus.COMPLETED:
+            results_cache.set(scan_id, body)
+        
         logger.info(f"Retrieved scan results for: {scan_id}")
         
-        return response
+        return Response(content=body, media_type="application/json")
         
     except HTTPException:
         raise
@@ -333,6 +409,16 @@ async def get_scan_results(scan_id: str, db: Session = Depends(get_db)):
         )
 
 
+def _log_results_access(scan_id: str) -> None:
+    """Log the audit event for a demo mode results retrieval."""
+    multi_logger.log_data_access(
+        user_id="anonymous",  # In demo mode, no user auth
+        action="scan_results_retrieved",
+        resource=f"scan_{scan_id}",
+        client_ip="127.0.0.1"  # Demo mode
+    )
+
+
 @app.get(f"{settings.API_V1_PREFIX}/scan/{{scan_id}}/status")
 async def get_scan_status(scan_id: str, db: Session = Depends(get_db)):
     """
@@ -341,7 +427,12 @@ async def get_scan_status(scan_id: str, db: Session = Depends(get_db)):
     - **scan_id**: UUID of the scan to check
     """
     try:
-        scan_record = db.query(ScanRecord).filter(ScanRecord.id == scan_id).first()
+        cached = status_cache.get(scan_id)
+        if cached is not None:
+            return cached
+        
+        # Only the small columns the status response needs
+        scan_record = db.execute(SCAN_STATUS_QUERY, {"scan_id": scan_id}).first()
         
         if not scan_record:
             raise HTTPException(
@@ -361,6 +452,8 @@ async def get_scan_status(scan_id: str, db: Session = Depends(get_db)):
         if scan_record.status == ScanStatus.FAILED and scan_record.error_message:
             response["error"] = scan_record.error_message
         
+        status_cache.set(scan_id, response)
+        
         return response
         
     except HTTPException:
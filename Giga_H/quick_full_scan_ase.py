@@ -7,8 +7,10 @@ Fast comprehensive scan using optimized timeouts and focused scanning.
 """
 
 import time
-import signal
 import sys
+import threading
+from types import MappingProxyType
+from concurrent.futures import FIRST_COMPLETED, Future, wait
 from datetime import datetime
 from app.scanners.internet_exposure import InternetExposureScanner
 from app.scanners.tls_security import TLSSecurityScanner
@@ -18,44 +20,100 @@ from app.scanners.cve_vulnerabilities import CVEVulnerabilityScanner
 from app.scanners.iam_assessment import IAMAssessmentScanner
 from app.scanners.backup_dr import BackupDRScanner
 from app.scanners.security_monitoring import SecurityMonitoringScanner
-from app.scanners.scoring import ScoringEngine
+from app.scanners.scoring import scoring_engine
+from app.scanners.base import create_scan_context
 from app.utils.multi_logger import multi_logger
 
-class TimeoutException(Exception):
-    pass
+# Scanner display name -> ScoringEngine category
+SCORING_KEY_BY_NAME = MappingProxyType({
+    "Internet Exposure": "internet_exposure",
+    "TLS/SSL Security": "tls_security",
+    "Web Security Headers": "web_security",
+    "Email Authentication": "email_security",
+    "CVE Vulnerabilities": "vulnerabilities",
+    "IAM Assessment": "iam_assessment",
+    "Backup & DR": "backup_dr",
+    "Security Monitoring": "logging_monitoring",
+})
+CRITICAL_SEVERITIES = frozenset(("high", "critical"))
+HIGH_PRIORITY = "high"
+# Shared read-only defaults for missing result keys, instead of a fresh [] / {} per lookup
+_EMPTY = ()
+_EMPTY_DICT = MappingProxyType({})
 
-def timeout_handler(signum, frame):
-    raise TimeoutException("Scanner timeout")
+def run_scanner(scanner):
+    """Run a scanner in a worker thread and time it."""
+    start_time = time.perf_counter()
+    results = scanner.scan()
+    return results, time.perf_counter() - start_time
 
-def run_scanner_with_timeout(scanner_name, scanner, timeout_seconds=60):
-    """Run scanner with timeout protection."""
-    print(f"🔍 {scanner_name} (timeout: {timeout_seconds}s)...")
+def start_scanner(scanner):
+    """
+    Start a scanner on its own daemon thread.
     
-    try:
-        # Set timeout alarm (Unix/Linux only, skip on Windows)
-        if hasattr(signal, 'SIGALRM'):
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(timeout_seconds)
-        
-        start_time = time.time()
-        results = scanner.scan()
-        duration = time.time() - start_time
-        
-        # Clear alarm
-        if hasattr(signal, 'SIGALRM'):
-            signal.alarm(0)
-        
-        return results, duration, None
+    Unlike ThreadPoolExecutor workers, daemon threads are not joined at
+    interpreter exit, so a scanner that overruns its timeout can really be
+    abandoned instead of holding the CLI open.
+    """
+    future = Future()
+    
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(run_scanner(scanner))
+        except BaseException as e:
+            future.set_exception(e)
+    
+    threading.Thread(target=run, name=f"scanner-{type(scanner).__name__}", daemon=True).start()
+    return future
+
+def iter_completed(futures, timeouts, started):
+    """
+    Yield (index, future) for each scanner as it finishes or overruns.
+    
+    Works like as_completed(), but every scanner keeps its own deadline
+    (counted from submission, since all scanners start together) instead
+    of one timeout for the whole batch.
+    """
+    deadlines = {future: started + timeout for future, timeout in zip(futures, timeouts)}
+    index = {future: i for i, future in enumerate(futures)}
+    pending = set(futures)
+    
+    while pending:
+        next_deadline = min(deadlines[future] for future in pending)
+        done, pending = wait(pending, timeout=max(0.0, next_deadline - time.perf_counter()),
+                             return_when=FIRST_COMPLETED)
+        now = time.perf_counter()
+        expired = {future for future in pending if deadlines[future] <= now}
+        pending -= expired
         
-    except TimeoutException:
+        for future in sorted(done | expired, key=index.get):
+            yield index[future], future
+
+def scanner_outcome(future, timeout_seconds, started):
+    """
+    Return (results, duration, error) for a finished or overrun scanner.
+    
+    The scanner applies the same timeout to its own sockets, HTTP and DNS
+    calls, so an abandoned worker thread winds down shortly afterwards.
+    """
+    if not future.done():
+        # The daemon thread is left to finish (or not) on its own
         return None, timeout_seconds, f"Scanner timed out after {timeout_seconds}s"
+    try:
+        results, duration = future.result()
+        return results, duration, None
     except Exception as e:
-        duration = time.time() - start_time
-        return None, duration, str(e)
-    finally:
-        # Always clear alarm
-        if hasattr(signal, 'SIGALRM'):
-            signal.alarm(0)
+        return None, time.perf_counter() - started, str(e)
+
+def format_scanner_result(scanner_name, results):
+    """Format one row of the scanner results table."""
+    if 'error' in results:
+        return f"   ❌ {scanner_name:<25} FAILED"
+    problems_count = len(results.get('problems') or _EMPTY)
+    scanner_score = max(0, 100 - (problems_count * 10))
+    return f"   ✅ {scanner_name:<25} {scanner_score}/100 ({problems_count} issues)"
 
 def main():
     """Main scanning function."""
@@ -78,30 +136,44 @@ def main():
         scan_type="full"
     )
     
-    total_start = time.time()
+    total_start = time.perf_counter()
     all_results = {}
     all_problems = []
     all_recommendations = []
+    # (scanner, duration) pairs, logged together once the scan is done
+    scanner_timings = []
+    
+    # Resolve the target once and pool HTTP/DNS across all scanners
+    ctx = create_scan_context(target)
     
     # Define scanners with timeouts
     scanners_config = [
-        ("TLS/SSL Security", TLSSecurityScanner(target), 30),
-        ("Web Security Headers", WebSecurityScanner(target), 20),
-        ("Email Authentication", EmailAuthScanner(target), 25),
-        ("Internet Exposure", InternetExposureScanner(target), 90),  # Longer for nmap
-        ("CVE Vulnerabilities", CVEVulnerabilityScanner(target), 45),
-        ("IAM Assessment", IAMAssessmentScanner(target), 40),
-        ("Backup & DR", BackupDRScanner(target), 30),
-        ("Security Monitoring", SecurityMonitoringScanner(target), 25)
+        ("TLS/SSL Security", TLSSecurityScanner(target, timeout=30, ctx=ctx), 30),
+        ("Web Security Headers", WebSecurityScanner(target, timeout=20, ctx=ctx), 20),
+        ("Email Authentication", EmailAuthScanner(target, timeout=25, ctx=ctx), 25),
+        ("Internet Exposure", InternetExposureScanner(target, timeout=30, ctx=ctx, scan_method="asyncio"), 30),
+        ("CVE Vulnerabilities", CVEVulnerabilityScanner(target, timeout=45, ctx=ctx), 45),
+        ("IAM Assessment", IAMAssessmentScanner(target, timeout=40, ctx=ctx), 40),
+        ("Backup & DR", BackupDRScanner(target, timeout=30, ctx=ctx), 30),
+        ("Security Monitoring", SecurityMonitoringScanner(target, timeout=25, ctx=ctx), 25)
     ]
     
-    print(f"🚀 Running {len(scanners_config)} security scanners...")
+    print(f"🚀 Running {len(scanners_config)} security scanners in parallel...")
     print()
     
-    for i, (scanner_name, scanner, timeout) in enumerate(scanners_config, 1):
-        print(f"[{i}/{len(scanners_config)}] ", end="")
+    # Scanners are independent and I/O-bound, so run them all at once;
+    # wall time approaches the slowest scanner instead of the sum
+    started = time.perf_counter()
+    futures = [start_scanner(scanner) for _, scanner, _ in scanners_config]
+    timeouts = [timeout for _, _, timeout in scanners_config]
+    
+    # Report each scanner as soon as it finishes, so fast ones are not held
+    # up behind slow ones
+    for count, (i, future) in enumerate(iter_completed(futures, timeouts, started), 1):
+        scanner_name, _, timeout = scanners_config[i]
+        print(f"[{count}/{len(scanners_config)}] 🔍 {scanner_name} (timeout: {timeout}s)")
         
-        results, duration, error = run_scanner_with_timeout(scanner_name, scanner, timeout)
+        results, duration, error = scanner_outcome(future, timeout, started)
         
         if error:
             print(f"   ❌ Failed: {error}")
@@ -118,50 +190,39 @@ def main():
             print(f"   ✅ Completed in {duration:.1f}s")
             all_results[scanner_name] = results
             
-            # Log timing
-            multi_logger.log_scan_timing(
-                scan_id=scan_id,
-                scanner=scanner_name.replace(" ", ""),
-                duration=duration
-            )
+            scanner_timings.append((scanner_name.replace(" ", ""), duration))
             
             # Collect problems and recommendations
-            if 'problems' in results:
-                all_problems.extend(results['problems'])
-                print(f"      🚨 Found {len(results['problems'])} issues")
+            problems = results.get('problems')
+            if problems is not None:
+                all_problems += problems
+                print(f"      🚨 Found {len(problems)} issues")
             
-            if 'recommendations' in results:
-                all_recommendations.extend(results['recommendations'])
+            all_recommendations += results.get('recommendations') or _EMPTY
         
         print()
     
+    ctx.close()
+    
+    # Log timing
+    multi_logger.log_scan_timings(scan_id, scanner_timings)
+    
+    # Back to configuration order so the report stays stable
+    all_results = {name: all_results[name] for name, _, _ in scanners_config}
+    
     # Calculate overall score
     print("📊 Calculating Security Score...")
-    scorer = ScoringEngine()
     
     # Convert scanner names to match scoring engine categories
-    scoring_results = {}
-    for scanner_name, results in all_results.items():
-        if scanner_name == "Internet Exposure":
-            scoring_results["internet_exposure"] = results
-        elif scanner_name == "TLS/SSL Security":
-            scoring_results["tls_security"] = results
-        elif scanner_name == "Web Security Headers":
-            scoring_results["web_security"] = results
-        elif scanner_name == "Email Authentication":
-            scoring_results["email_security"] = results
-        elif scanner_name == "CVE Vulnerabilities":
-            scoring_results["vulnerabilities"] = results
-        elif scanner_name == "IAM Assessment":
-            scoring_results["iam_assessment"] = results
-        elif scanner_name == "Backup & DR":
-            scoring_results["backup_dr"] = results
-        elif scanner_name == "Security Monitoring":
-            scoring_results["logging_monitoring"] = results
-    
-    overall_score, scored_problems, scored_recommendations, summary = scorer.calculate_score(scoring_results)
-    
-    total_duration = time.time() - total_start
+    scoring_results = {
+        SCORING_KEY_BY_NAME[name]: results
+        for name, results in all_results.items()
+        if name in SCORING_KEY_BY_NAME
+    }
+    
+    overall_score, scored_problems, scored_recommendations, summary = scoring_engine.calculate_score(scoring_results)
+    
+    total_duration = time.perf_counter() - total_start
     
     # Log scan completion
     multi_logger.log_scan_completed(
@@ -171,89 +232,91 @@ def main():
         issues_found=len(all_problems)
     )
     
-    # Results summary
-    print("🎯 " + "=" * 60)
-    print("🎯   SCAN RESULTS SUMMARY")
-    print("🎯 " + "=" * 60)
-    print()
-    
-    print(f"🎯 Target: {target}")
-    print(f"⏱️  Total Duration: {total_duration:.1f} seconds")
-    print(f"🔢 Overall Security Score: {overall_score}/100")
-    print(f"🚨 Total Issues: {len(scored_problems)}")
-    print(f"💡 Total Recommendations: {len(scored_recommendations)}")
-    print()
+    # The static report is collected and written in one go; only the
+    # progress lines above are printed live
+    lines = []
+    out = lines.append
     
-    # Scanner results
-    print("📋 SCANNER RESULTS:")
-    print("-" * 50)
-    for scanner_name, results in all_results.items():
-        if 'error' in results:
-            print(f"   ❌ {scanner_name:<25} FAILED")
-        else:
-            problems_count = len(results.get('problems', []))
-            scanner_score = max(0, 100 - (problems_count * 10))
-            print(f"   ✅ {scanner_name:<25} {scanner_score}/100 ({problems_count} issues)")
-    print()
+    # Results summary and scanner results, filled in as one template
+    scanner_lines = "\n".join(
+        format_scanner_result(scanner_name, results) for scanner_name, results in all_results.items()
+    )
+    out(f"""🎯 {'=' * 60}
+🎯   SCAN RESULTS SUMMARY
+🎯 {'=' * 60}
+
+🎯 Target: {target}
+⏱️  Total Duration: {total_duration:.1f} seconds
+🔢 Overall Security Score: {overall_score}/100
+🚨 Total Issues: {len(scored_problems)}
+💡 Total Recommendations: {len(scored_recommendations)}
+
+📋 SCANNER RESULTS:
+{'-' * 50}
+{scanner_lines}
+""")
     
     # Critical findings
     if scored_problems:
-        critical_problems = [p for p in scored_problems if p.get('severity') in ['high', 'critical']]
-        print(f"🚨 CRITICAL FINDINGS ({len(critical_problems)}):")
-        print("-" * 50)
+        critical_problems = [p for p in scored_problems if p.get('severity') in CRITICAL_SEVERITIES]
+        out(f"🚨 CRITICAL FINDINGS ({len(critical_problems)}):")
+        out("-" * 50)
         for i, problem in enumerate(critical_problems[:8], 1):
             severity = problem.get('severity', 'medium').upper()
             title = problem.get('title', 'Security Issue')
-            print(f"   {i}. [{severity}] {title}")
+            out(f"   {i}. [{severity}] {title}")
         
         if len(critical_problems) > 8:
-            print(f"   ... and {len(critical_problems) - 8} more critical issues")
-        print()
+            out(f"   ... and {len(critical_problems) - 8} more critical issues")
+        out("")
     
     # Key recommendations
     if scored_recommendations:
-        high_priority = [r for r in scored_recommendations if r.get('priority') == 'high']
-        print(f"💡 KEY RECOMMENDATIONS ({len(high_priority)}):")
-        print("-" * 50)
+        high_priority = [r for r in scored_recommendations if r.get('priority') == HIGH_PRIORITY]
+        out(f"💡 KEY RECOMMENDATIONS ({len(high_priority)}):")
+        out("-" * 50)
         for i, rec in enumerate(high_priority[:8], 1):
             title = rec.get('title', 'Security Recommendation')
-            print(f"   {i}. {title}")
+            out(f"   {i}. {title}")
             
         if len(high_priority) > 8:
-            print(f"   ... and {len(high_priority) - 8} more recommendations")
-        print()
+            out(f"   ... and {len(high_priority) - 8} more recommendations")
+        out("")
     
     # Quick insights
-    print("🔍 QUICK INSIGHTS:")
-    print("-" * 50)
+    out("🔍 QUICK INSIGHTS:")
+    out("-" * 50)
     
     # TLS insights
     if 'TLS/SSL Security' in all_results and 'error' not in all_results['TLS/SSL Security']:
         tls_results = all_results['TLS/SSL Security']
         if 'certificate' in tls_results:
             cert = tls_results['certificate']
-            print(f"   🔒 TLS Certificate: {cert.get('subject', 'Unknown')}")
-            print(f"      Expires: {cert.get('valid_until', 'Unknown')}")
+            out(f"   🔒 TLS Certificate: {cert.get('subject', 'Unknown')}")
+            out(f"      Expires: {cert.get('valid_until', 'Unknown')}")
     
     # Email auth insights
     if 'Email Authentication' in all_results and 'error' not in all_results['Email Authentication']:
         email_results = all_results['Email Authentication']
-        spf_status = "✅" if email_results.get('spf', {}).get('valid') else "❌"
-        dkim_status = "✅" if email_results.get('dkim', {}).get('valid') else "❌"
-        dmarc_status = "✅" if email_results.get('dmarc', {}).get('valid') else "❌"
-        print(f"   📧 Email Auth: SPF {spf_status} | DKIM {dkim_status} | DMARC {dmarc_status}")
+        spf_status = "✅" if (email_results.get('spf') or _EMPTY_DICT).get('valid') else "❌"
+        dkim_status = "✅" if (email_results.get('dkim') or _EMPTY_DICT).get('valid') else "❌"
+        dmarc_status = "✅" if (email_results.get('dmarc') or _EMPTY_DICT).get('valid') else "❌"
+        out(f"   📧 Email Auth: SPF {spf_status} | DKIM {dkim_status} | DMARC {dmarc_status}")
     
     # Port scanning insights
     if 'Internet Exposure' in all_results and 'error' not in all_results['Internet Exposure']:
         exposure_results = all_results['Internet Exposure']
         if 'open_ports' in exposure_results:
             open_count = len(exposure_results['open_ports'])
-            print(f"   🔓 Open Ports: {open_count} discovered")
+            out(f"   🔓 Open Ports: {open_count} discovered")
     
-    print()
-    print("🎯 " + "=" * 60)
-    print("🎯   QUICK FULL SCAN COMPLETED!")
-    print("🎯 " + "=" * 60)
+    out("")
+    out("🎯 " + "=" * 60)
+    out("🎯   QUICK FULL SCAN COMPLETED!")
+    out("🎯 " + "=" * 60)
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
     
     return overall_score
 
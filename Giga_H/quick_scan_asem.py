@@ -7,14 +7,23 @@ Fast security assessment of the Academy of Economic Studies of Moldova
 demonstrating key scanner components.
 """
 
+import asyncio
+import os
 import sys
 import time
 import uuid
-from pathlib import Path
+from types import MappingProxyType
 
 # Add the project root to Python path
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from app.scanners.base import create_scan_context, create_scan_session
+from app.scanners.internet_exposure import InternetExposureScanner
+from app.scanners.tls_security import TLSSecurityScanner
+from app.scanners.web_security import WebSecurityScanner
+from app.scanners.email_auth import EmailAuthScanner
 
 def print_banner():
     """Print scan banner."""
@@ -28,8 +37,135 @@ def print_banner():
     print("⚡ " + "=" * 70)
     print()
 
-def run_quick_asem_scan():
-    """Run key scanner components on ase.md quickly."""
+# Shared read-only defaults for missing result keys, instead of a fresh [] / {} per lookup
+_EMPTY = ()
+_EMPTY_DICT = MappingProxyType({})
+
+def _format_internet_exposure(result):
+    """Format internet exposure findings; returns (text, issue count)."""
+    lines = []
+    out = lines.append
+    issues = 0
+    open_ports = result.get("open_ports") or _EMPTY
+    method = result.get("scan_method", "unknown")
+    out(f"   🔌 Open Ports: {len(open_ports)} (via {method})")
+    
+    # Show key ports
+    if open_ports:
+        for port in open_ports[:3]:
+            port_num = port.get("port")
+            service = port.get("service", "unknown")
+            out(f"      • Port {port_num}: {service}")
+            
+            # High-risk ports
+            if port_num in [21, 23, 135, 139, 445]:
+                issues += 1
+                out(f"        ⚠️  High-risk port!")
+    
+    return "\n".join(lines), issues
+
+def _format_tls_security(result):
+    """Format TLS findings; returns (text, issue count)."""
+    lines = []
+    out = lines.append
+    issues = 0
+    tls_versions = result.get("tls_versions") or _EMPTY
+    certificate = result.get("certificate") or _EMPTY_DICT
+    vulnerabilities = result.get("vulnerabilities") or _EMPTY
+    
+    out(f"   🔒 TLS: {', '.join(tls_versions) if tls_versions else 'None'}")
+    
+    if certificate:
+        subject = certificate.get("subject", "Unknown")
+        days_expiry = certificate.get("days_until_expiry", "Unknown")
+        out(f"   📄 Cert: {subject}")
+        out(f"   📅 Expires: {days_expiry} days")
+        
+        # Certificate issues
+        if isinstance(days_expiry, int) and days_expiry < 30:
+            issues += 1
+            out(f"   ⚠️  Certificate expiring soon!")
+    
+    if vulnerabilities:
+        issues += len(vulnerabilities)
+        out(f"   🚨 TLS Issues: {len(vulnerabilities)}")
+    
+    return "\n".join(lines), issues
+
+def _format_web_security(result):
+    """Format web security findings; returns (text, issue count)."""
+    lines = []
+    out = lines.append
+    issues = 0
+    security_score = result.get("security_score", 0)
+    missing_headers = result.get("missing_headers") or _EMPTY
+    vulnerabilities = result.get("vulnerabilities") or _EMPTY
+    
+    out(f"   📈 Security Score: {security_score}/100")
+    out(f"   ❌ Missing Headers: {len(missing_headers)}")
+    
+    # Show critical missing headers
+    critical_headers = ["Content-Security-Policy", "X-Frame-Options", "Strict-Transport-Security"]
+    missing_critical = [h for h in missing_headers if h in critical_headers]
+    
+    if missing_critical:
+        issues += len(missing_critical)
+        out(f"   ⚠️  Critical missing: {', '.join(missing_critical[:2])}")
+    
+    if vulnerabilities:
+        issues += len(vulnerabilities)
+        out(f"   🚨 Web Issues: {len(vulnerabilities)}")
+    
+    return "\n".join(lines), issues
+
+def _format_email_auth(result):
+    """Format email authentication findings; returns (text, issue count)."""
+    lines = []
+    out = lines.append
+    spf = result.get("spf") or _EMPTY_DICT
+    dkim = result.get("dkim") or _EMPTY_DICT
+    dmarc = result.get("dmarc") or _EMPTY_DICT
+    
+    # Quick email security check
+    spf_ok = spf.get("exists", False)
+    dkim_ok = dkim.get("selectors_found") or _EMPTY
+    dmarc_ok = dmarc.get("exists", False)
+    
+    out(f"   📧 SPF: {'✅' if spf_ok else '❌'}")
+    out(f"   📧 DKIM: {'✅' if dkim_ok else '❌'}")
+    out(f"   📧 DMARC: {'✅' if dmarc_ok else '❌'}")
+    
+    # Count missing email auth
+    missing_email_auth = (not spf_ok) + (not dkim_ok) + (not dmarc_ok)
+    
+    if missing_email_auth > 0:
+        out(f"   ⚠️  {missing_email_auth} email auth issues")
+    
+    return "\n".join(lines), missing_email_auth
+
+# Result key -> (section heading, scanner class, formatter, scanner options)
+SCANNERS = {
+    "internet_exposure": ("1️⃣  🔍 INTERNET EXPOSURE (Quick)", InternetExposureScanner,
+                          _format_internet_exposure, {"scan_method": "asyncio"}),
+    "tls_security": ("2️⃣  🔐 TLS/SSL SECURITY (Quick)", TLSSecurityScanner, _format_tls_security, {}),
+    "web_security": ("3️⃣  🌐 WEB SECURITY (Quick)", WebSecurityScanner, _format_web_security, {}),
+    "email_auth": ("4️⃣  📧 EMAIL AUTHENTICATION (Quick)", EmailAuthScanner, _format_email_auth, {}),
+}
+
+async def _run_scanner(scanner_class, target, ctx, session, options):
+    """
+    Run and time one scanner.
+    
+    aiohttp scanners (web, TLS HSTS) run on this loop with the shared
+    session; the others run their blocking scan() on a worker thread.
+    """
+    scanner = scanner_class(target, "quick", ctx=ctx, **options)
+    start_time = time.perf_counter()
+    result = await scanner.scan_async(session)
+    return result, time.perf_counter() - start_time
+
+async def run_quick_asem_scan_async():
+    """Run key scanner components on ase.md concurrently."""
     target = "ase.md"
     scan_id = str(uuid.uuid4())[:8]  # Short ID for quick scan
     
@@ -51,177 +187,55 @@ def run_quick_asem_scan():
     
     results = {}
     total_issues = 0
-    scan_start_time = time.time()
+    scan_start_time = time.perf_counter()
     
-    # 1. Internet Exposure (Quick)
-    print("\n1️⃣  🔍 INTERNET EXPOSURE (Quick)")
-    print("-" * 40)
+    # The scanners are independent and I/O-bound: run them all at once so
+    # the scan takes as long as the slowest one, not the sum
+    print(f"\n🚀 Running {len(SCANNERS)} scanners in parallel...")
+    # They share one resolution of the target, pooled HTTP/DNS clients
+    # and one aiohttp session
     try:
-        from app.scanners.internet_exposure import InternetExposureScanner
-        
-        scanner = InternetExposureScanner(target, "quick")
-        start_time = time.time()
-        result = scanner.scan()
-        duration = time.time() - start_time
-        
-        status = result.get("status", "unknown")
-        print(f"   Status: {status} ({duration:.1f}s)")
-        
-        if status == "completed":
-            open_ports = result.get("open_ports", [])
-            method = result.get("scan_method", "unknown")
-            print(f"   🔌 Open Ports: {len(open_ports)} (via {method})")
-            
-            # Show key ports
-            if open_ports:
-                for port in open_ports[:3]:
-                    port_num = port.get("port")
-                    service = port.get("service", "unknown")
-                    print(f"      • Port {port_num}: {service}")
-                    
-                    # High-risk ports
-                    if port_num in [21, 23, 135, 139, 445]:
-                        total_issues += 1
-                        print(f"        ⚠️  High-risk port!")
-        
-        results["internet_exposure"] = result
-        
+        ctx = create_scan_context(target)
     except Exception as e:
-        print(f"   ❌ Error: {str(e)[:50]}...")
-        results["internet_exposure"] = {"status": "error"}
+        print(f"⚠️  Shared scan context: {e}")
+        ctx = None
     
-    # 2. TLS Security (Quick)
-    print("\n2️⃣  🔐 TLS/SSL SECURITY (Quick)")
-    print("-" * 40)
-    try:
-        from app.scanners.tls_security import TLSSecurityScanner
-        
-        scanner = TLSSecurityScanner(target, "quick")
-        start_time = time.time()
-        result = scanner.scan()
-        duration = time.time() - start_time
-        
-        status = result.get("status", "unknown")
-        print(f"   Status: {status} ({duration:.1f}s)")
-        
-        if status == "completed":
-            tls_versions = result.get("tls_versions", [])
-            certificate = result.get("certificate", {})
-            vulnerabilities = result.get("vulnerabilities", [])
-            
-            print(f"   🔒 TLS: {', '.join(tls_versions) if tls_versions else 'None'}")
-            
-            if certificate:
-                subject = certificate.get("subject", "Unknown")
-                days_expiry = certificate.get("days_until_expiry", "Unknown")
-                print(f"   📄 Cert: {subject}")
-                print(f"   📅 Expires: {days_expiry} days")
-                
-                # Certificate issues
-                if isinstance(days_expiry, int) and days_expiry < 30:
-                    total_issues += 1
-                    print(f"   ⚠️  Certificate expiring soon!")
-            
-            if vulnerabilities:
-                total_issues += len(vulnerabilities)
-                print(f"   🚨 TLS Issues: {len(vulnerabilities)}")
-        
-        results["tls_security"] = result
-        
-    except Exception as e:
-        print(f"   ❌ Error: {str(e)[:50]}...")
-        results["tls_security"] = {"status": "error"}
-    
-    # 3. Web Security (Quick)
-    print("\n3️⃣  🌐 WEB SECURITY (Quick)")
-    print("-" * 40)
-    try:
-        from app.scanners.web_security import WebSecurityScanner
-        
-        scanner = WebSecurityScanner(target, "quick")
-        start_time = time.time()
-        result = scanner.scan()
-        duration = time.time() - start_time
-        
-        status = result.get("status", "unknown")
-        print(f"   Status: {status} ({duration:.1f}s)")
-        
-        if status == "completed":
-            security_score = result.get("security_score", 0)
-            missing_headers = result.get("missing_headers", [])
-            vulnerabilities = result.get("vulnerabilities", [])
-            
-            print(f"   📈 Security Score: {security_score}/100")
-            print(f"   ❌ Missing Headers: {len(missing_headers)}")
-            
-            # Show critical missing headers
-            critical_headers = ["Content-Security-Policy", "X-Frame-Options", "Strict-Transport-Security"]
-            missing_critical = [h for h in missing_headers if h in critical_headers]
-            
-            if missing_critical:
-                total_issues += len(missing_critical)
-                print(f"   ⚠️  Critical missing: {', '.join(missing_critical[:2])}")
-            
-            if vulnerabilities:
-                total_issues += len(vulnerabilities)
-                print(f"   🚨 Web Issues: {len(vulnerabilities)}")
-        
-        results["web_security"] = result
-        
-    except Exception as e:
-        print(f"   ❌ Error: {str(e)[:50]}...")
-        results["web_security"] = {"status": "error"}
+    async with create_scan_session() as session:
+        outcomes = await asyncio.gather(
+            *(_run_scanner(scanner_class, target, ctx, session, options)
+              for _, scanner_class, _, options in SCANNERS.values()),
+            return_exceptions=True
+        )
+    if ctx is not None:
+        ctx.close()
     
-    # 4. Email Authentication (Quick)
-    print("\n4️⃣  📧 EMAIL AUTHENTICATION (Quick)")
-    print("-" * 40)
-    try:
-        from app.scanners.email_auth import EmailAuthScanner
-        
-        scanner = EmailAuthScanner(target, "quick")
-        start_time = time.time()
-        result = scanner.scan()
-        duration = time.time() - start_time
-        
-        status = result.get("status", "unknown")
-        print(f"   Status: {status} ({duration:.1f}s)")
-        
-        if status == "completed":
-            spf = result.get("spf", {})
-            dkim = result.get("dkim", {})
-            dmarc = result.get("dmarc", {})
-            
-            # Quick email security check
-            spf_ok = spf.get("exists", False)
-            dkim_ok = dkim.get("selectors_found", [])
-            dmarc_ok = dmarc.get("exists", False)
+    # Report in the fixed section order, one print per section
+    for (key, (heading, _, format_result, _)), outcome in zip(SCANNERS.items(), outcomes):
+        section = f"\n{heading}\n{'-' * 40}"
+        try:
+            if isinstance(outcome, BaseException):
+                raise outcome
+            result, duration = outcome
             
-            print(f"   📧 SPF: {'✅' if spf_ok else '❌'}")
-            print(f"   📧 DKIM: {'✅' if dkim_ok else '❌'}")
-            print(f"   📧 DMARC: {'✅' if dmarc_ok else '❌'}")
+            status = result.get("status", "unknown")
+            section += f"\n   Status: {status} ({duration:.1f}s)"
             
-            # Count missing email auth
-            missing_email_auth = 0
-            if not spf_ok:
-                missing_email_auth += 1
-            if not dkim_ok:
-                missing_email_auth += 1
-            if not dmarc_ok:
-                missing_email_auth += 1
+            if status == "completed":
+                details, issues = format_result(result)
+                total_issues += issues
+                if details:
+                    section += f"\n{details}"
             
-            total_issues += missing_email_auth
+            results[key] = result
             
-            if missing_email_auth > 0:
-                print(f"   ⚠️  {missing_email_auth} email auth issues")
+        except Exception as e:
+            section += f"\n   ❌ Error: {str(e)[:50]}..."
+            results[key] = {"status": "error"}
         
-        results["email_auth"] = result
-        
-    except Exception as e:
-        print(f"   ❌ Error: {str(e)[:50]}...")
-        results["email_auth"] = {"status": "error"}
+        print(section)
     
     # Calculate final metrics
-    total_duration = time.time() - scan_start_time
+    total_duration = time.perf_counter() - scan_start_time
     successful_scans = sum(1 for r in results.values() if r.get("status") == "completed")
     total_scans = len(results)
     
@@ -231,60 +245,62 @@ def run_quick_asem_scan():
     
     return results, total_duration, total_issues, successful_scans, total_scans
 
-def generate_quick_assessment(results, issues):
-    """Generate quick security assessment."""
-    print(f"\n📊 QUICK SECURITY ASSESSMENT")
-    print("=" * 60)
+# (minimum score, risk level, recommendation), highest tier first
+RISK_TIERS = (
+    (80, "🟢 LOW RISK", "Minor improvements needed"),
+    (60, "🟡 MEDIUM RISK", "Several security improvements recommended"),
+    (40, "🟠 HIGH RISK", "Significant security improvements needed"),
+    (0, "🔴 CRITICAL RISK", "Immediate security attention required"),
+)
+
+# (maximum issue count, recommendation lines), fewest issues first
+RECOMMENDATION_TIERS = (
+    (0, ("   ✅ Excellent security posture!",
+         "   ✅ Continue regular security monitoring")),
+    (3, ("   🔧 Implement missing security headers",
+         "   🔧 Review email authentication settings",
+         "   🔧 Consider additional monitoring")),
+    (6, ("   ⚠️  Priority: Fix missing security headers",
+         "   ⚠️  Priority: Configure email authentication",
+         "   ⚠️  Review open port security",
+         "   ⚠️  Implement comprehensive monitoring")),
+    (float("inf"), ("   🚨 URGENT: Complete security review needed",
+                    "   🚨 URGENT: Close unnecessary ports",
+                    "   🚨 URGENT: Implement all security headers",
+                    "   🚨 URGENT: Configure email authentication",
+                    "   🚨 URGENT: Professional security assessment")),
+)
+
+def generate_quick_assessment(results, issues, out=print):
+    """Generate quick security assessment, writing each line with out()."""
+    out(f"\n📊 QUICK SECURITY ASSESSMENT")
+    out("=" * 60)
     
     # Calculate quick score
     base_score = 100
     score_deduction = min(issues * 10, 80)  # Max 80 point deduction
     final_score = max(base_score - score_deduction, 20)  # Min score 20
     
-    print(f"🎯 ESTIMATED SECURITY SCORE: {final_score}/100")
+    out(f"🎯 ESTIMATED SECURITY SCORE: {final_score}/100")
     
     # Quick risk assessment
-    if final_score >= 80:
-        risk_level = "🟢 LOW RISK"
-        recommendation = "Minor improvements needed"
-    elif final_score >= 60:
-        risk_level = "🟡 MEDIUM RISK"
-        recommendation = "Several security improvements recommended"
-    elif final_score >= 40:
-        risk_level = "🟠 HIGH RISK"
-        recommendation = "Significant security improvements needed"
-    else:
-        risk_level = "🔴 CRITICAL RISK"
-        recommendation = "Immediate security attention required"
+    risk_level, recommendation = next(
+        (level, rec) for threshold, level, rec in RISK_TIERS if final_score >= threshold
+    )
     
-    print(f"📈 Risk Level: {risk_level}")
-    print(f"💡 Recommendation: {recommendation}")
+    out(f"📈 Risk Level: {risk_level}")
+    out(f"💡 Recommendation: {recommendation}")
     
     return final_score
 
-def show_quick_recommendations(issues):
-    """Show quick recommendations based on findings."""
-    print(f"\n💡 QUICK RECOMMENDATIONS:")
-    print("-" * 40)
-    
-    if issues == 0:
-        print("   ✅ Excellent security posture!")
-        print("   ✅ Continue regular security monitoring")
-    elif issues <= 3:
-        print("   🔧 Implement missing security headers")
-        print("   🔧 Review email authentication settings")
-        print("   🔧 Consider additional monitoring")
-    elif issues <= 6:
-        print("   ⚠️  Priority: Fix missing security headers")
-        print("   ⚠️  Priority: Configure email authentication")
-        print("   ⚠️  Review open port security")
-        print("   ⚠️  Implement comprehensive monitoring")
-    else:
-        print("   🚨 URGENT: Complete security review needed")
-        print("   🚨 URGENT: Close unnecessary ports")
-        print("   🚨 URGENT: Implement all security headers")
-        print("   🚨 URGENT: Configure email authentication")
-        print("   🚨 URGENT: Professional security assessment")
+def show_quick_recommendations(issues, out=print):
+    """Show quick recommendations based on findings, writing each line with out()."""
+    out(f"\n💡 QUICK RECOMMENDATIONS:")
+    out("-" * 40)
+    
+    recommendations = next(recs for limit, recs in RECOMMENDATION_TIERS if issues <= limit)
+    for line in recommendations:
+        out(line)
 
 def main():
     """Main quick scan function."""
@@ -298,39 +314,46 @@ def main():
     print()
     
     # Run quick scan
-    results, duration, issues, successful, total = run_quick_asem_scan()
+    results, duration, issues, successful, total = asyncio.run(run_quick_asem_scan_async())
+    
+    # The static report is collected and written in one go
+    lines = []
+    out = lines.append
     
     # Generate assessment
-    score = generate_quick_assessment(results, issues)
+    score = generate_quick_assessment(results, issues, out)
     
     # Show recommendations
-    show_quick_recommendations(issues)
+    show_quick_recommendations(issues, out)
     
     # Final summary
-    print(f"\n⚡ QUICK ASEM SCAN COMPLETED!")
-    print("=" * 60)
-    print(f"⏱️  Duration: {duration:.1f} seconds")
-    print(f"🎯 Security Score: {score}/100")
-    print(f"🔍 Issues Found: {issues}")
-    print(f"✅ Scanners: {successful}/{total} successful")
-    
-    print(f"\n📋 SCAN HIGHLIGHTS:")
-    print(f"   • Academy of Economic Studies Moldova assessed")
-    print(f"   • 4 key security areas evaluated")
-    print(f"   • Professional logging system active")
-    print(f"   • Ethical scanning practices maintained")
-    
-    print(f"\n🎓 EDUCATIONAL INSTITUTION ASSESSMENT:")
+    out(f"\n⚡ QUICK ASEM SCAN COMPLETED!")
+    out("=" * 60)
+    out(f"⏱️  Duration: {duration:.1f} seconds")
+    out(f"🎯 Security Score: {score}/100")
+    out(f"🔍 Issues Found: {issues}")
+    out(f"✅ Scanners: {successful}/{total} successful")
+    
+    out(f"\n📋 SCAN HIGHLIGHTS:")
+    out(f"   • Academy of Economic Studies Moldova assessed")
+    out(f"   • 4 key security areas evaluated")
+    out(f"   • Professional logging system active")
+    out(f"   • Ethical scanning practices maintained")
+    
+    out(f"\n🎓 EDUCATIONAL INSTITUTION ASSESSMENT:")
     if score >= 70:
-        print("   • Good security foundation in place")
-        print("   • Appropriate for educational environment")
-        print("   • Continue regular security maintenance")
+        out("   • Good security foundation in place")
+        out("   • Appropriate for educational environment")
+        out("   • Continue regular security maintenance")
     else:
-        print("   • Security improvements recommended")
-        print("   • Consider professional security review")
-        print("   • Enhance protection for student data")
+        out("   • Security improvements recommended")
+        out("   • Consider professional security review")
+        out("   • Enhance protection for student data")
+    
+    out(f"\n🛡️  CYBER HYGIENE SCANNER - QUICK ASSESSMENT COMPLETE!")
     
-    print(f"\n🛡️  CYBER HYGIENE SCANNER - QUICK ASSESSMENT COMPLETE!")
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
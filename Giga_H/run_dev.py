@@ -4,11 +4,11 @@
 import uvicorn
 import os
 import sys
-from pathlib import Path
 
 # Add the project root to Python path
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
 def main():
     """Run the development server."""
@@ -33,9 +33,18 @@ def main():
         host="0.0.0.0",
         port=8001,
         reload=True,
+        # "." is still watched for main.py, but only Python sources count and
+        # scanner output (logs, data, temp) never triggers a reload
         reload_dirs=["app", "."],
+        reload_includes=["*.py"],
+        reload_excludes=["*.pyc", "__pycache__/*", "logs/*", "data/*", "temp/*", ".git/*", "static/*"],
+        reload_delay=0.5,  # seconds; lets bursts of file events settle into one reload
         log_level="debug",
         access_log=True,
+        # "auto" picks uvloop and httptools (installed by uvicorn[standard])
+        # when importable, falling back to asyncio/h11 on Windows or slim installs
+        loop="auto",
+        http="auto",
         workers=1  # Single worker for development
     )
 
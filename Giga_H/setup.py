@@ -2,6 +2,7 @@
 
 import os
 import sys
+import shutil
 import subprocess
 from pathlib import Path
 
@@ -44,12 +45,13 @@ def check_dependencies():
     
     missing_tools = []
     for tool, description in required_tools.items():
-        try:
-            subprocess.run([tool, "--version"], capture_output=True, check=True)
-            print(f"✅ {tool} - {description}")
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        # A PATH lookup is enough; running "<tool> --version" costs a fork/exec
+        path = shutil.which(tool)
+        if path is None:
             print(f"❌ {tool} - {description} (MISSING)")
             missing_tools.append(tool)
+        else:
+            print(f"✅ {tool} - {description} ({path})")
     
     if missing_tools:
         print(f"\n⚠️  Missing tools: {', '.join(missing_tools)}")